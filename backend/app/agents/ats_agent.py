@@ -1,12 +1,33 @@
-from app.services.redis_cache import get_cache, set_cache, generate_cache_key
-from app.models.cross_encoder import ATSCrossEncoder
+from app.services.redis_cache import (
+    get_cache,
+    set_cache,
+    mget_cache,
+    mset_cache,
+    content_hash,
+    generate_cache_key,
+)
+from app.core.config import settings
+from app.models.cross_encoder import get_ats_encoder
 
 # Import both tracer and the new shortlist_counter from your observability module
 from app.core.observability import tracer, shortlist_counter
 import logging
 
 logger = logging.getLogger(__name__)
-encoder = ATSCrossEncoder()
+encoder = get_ats_encoder()
+
+
+def _resume_hash(state) -> str:
+    """Full-content resume hash, computed once per request and kept in state."""
+    if not state.get("resume_hash"):
+        state["resume_hash"] = content_hash(state.get("resume", ""))
+    return state["resume_hash"]
+
+
+def _score_key(resume_hash: str, jd: str) -> str:
+    return generate_cache_key(
+        f"ats_v2:{encoder.model_id}", resume_hash, content_hash(jd)
+    )
 
 
 async def ats_agent(state):
@@ -14,6 +35,10 @@ async def ats_agent(state):
     Industry-grade ATS Scoring Agent.
     Optimized for SigNoz Visualizations and performance.
     """
+    # Batched mode: rank every sourced job in one forward pass
+    if state.get("jobs"):
+        return await _score_sourced_jobs(state)
+
     resume = state.get("resume", "")
     # Robust check for nested JD data
     job_obj = state.get("job", {})
@@ -26,10 +51,10 @@ async def ats_agent(state):
         span.set_attribute("resume.size_bytes", len(resume))
 
         # 2. Optimized Cache Logic
-        cache_key = generate_cache_key("ats_v1", resume[:500], jd[:500])
+        cache_key = _score_key(_resume_hash(state), jd)
 
         with tracer.start_as_current_span("redis_check") as cache_span:
-            cached_score = get_cache(cache_key)
+            cached_score = await get_cache(cache_key)
             if cached_score is not None:
                 cache_span.set_attribute("cache.hit", True)
                 span.set_attribute("ats.source", "cache")
@@ -43,7 +68,7 @@ async def ats_agent(state):
                 "cross_encoder_inference"
             ) as inference_span:
                 # Actual AI calculation
-                score = encoder.score(resume, jd)
+                score = await encoder.score_async(resume, jd)
 
                 # Add metadata for model versioning
                 inference_span.set_attribute(
@@ -52,10 +77,10 @@ async def ats_agent(state):
                 inference_span.set_attribute("ml.score_output", score)
 
             # 4. Persistence & Metrics
-            set_cache(cache_key, score, ttl=86400)
+            await set_cache(cache_key, score, ttl=settings.ATS_CACHE_TTL)
 
             # TRIGGER METRIC: This allows you to build a 'Success Rate' chart in SigNoz
-            if score >= 80:
+            if score >= settings.ATS_SHORTLIST_THRESHOLD:
                 shortlist_counter.add(1, {"job_title": job_obj.get("title", "unknown")})
 
             span.set_attribute("ats.score", score)
@@ -69,3 +94,92 @@ async def ats_agent(state):
             state["error"] = "Analysis engine temporarily unavailable."
 
         return state
+
+
+async def _score_sourced_jobs(state):
+    """
+    Stage two of retrieve-then-rerank: the cross-encoder rescores the top
+    RERANK_TOP_M retrieved candidates in batches, stopping early once
+    RERANK_SHORTLIST_TARGET jobs clear the shortlist threshold.
+    Cache hits are reused; only the misses go through the cross-encoder.
+    """
+    resume = state.get("resume", "")
+    # Stage-one (retrieval) order decides who gets reranked first
+    candidates = state["jobs"][: settings.RERANK_TOP_M]
+    threshold = settings.ATS_SHORTLIST_THRESHOLD
+
+    with tracer.start_as_current_span("ATSBatchScoringAgent") as span:
+        span.set_attribute("service.name", "nexus-talent-api")
+        span.set_attribute("component", "ml-inference")
+        span.set_attribute("resume.size_bytes", len(resume))
+        span.set_attribute("ats.candidates", len(candidates))
+
+        # 1. Per-job cache lookups
+        resume_hash = _resume_hash(state)
+        cache_keys = [_score_key(resume_hash, job.get("jd")) for job in candidates]
+        pending = []
+        cached_scores = await mget_cache(cache_keys)
+        for idx, (job, cached_score) in enumerate(zip(candidates, cached_scores)):
+            if cached_score is not None:
+                job["score"] = cached_score
+            else:
+                pending.append(idx)
+        span.set_attribute("ats.cache_hits", len(candidates) - len(pending))
+
+        # 2. Batched reranking of the misses with early termination
+        pending_set = set(pending)
+        scored = [i for i in range(len(candidates)) if i not in pending_set]
+        try:
+            batch_size = settings.RERANK_BATCH_SIZE
+            for start in range(0, len(pending), batch_size):
+                shortlisted = sum(
+                    1 for i in scored if candidates[i]["score"] >= threshold
+                )
+                if shortlisted >= settings.RERANK_SHORTLIST_TARGET:
+                    span.set_attribute("ats.early_terminated", True)
+                    break
+
+                batch = pending[start : start + batch_size]
+                with tracer.start_as_current_span(
+                    "cross_encoder_batch_inference"
+                ) as inference_span:
+                    scores = await encoder.score_batch_async(
+                        resume, [candidates[i].get("jd") or "" for i in batch]
+                    )
+                    inference_span.set_attribute(
+                        "ml.model_name", "cross-encoder-distilbert"
+                    )
+                    inference_span.set_attribute("ml.pairs", len(batch))
+
+                for idx, score in zip(batch, scores):
+                    candidates[idx]["score"] = score
+                scored.extend(batch)
+                await mset_cache(
+                    {cache_keys[idx]: candidates[idx]["score"] for idx in batch},
+                    ttl=settings.ATS_CACHE_TTL,
+                )
+
+        except Exception as e:
+            logger.error(f"ATS Batch Inference Error: {str(e)}")
+            span.record_exception(e)
+            span.set_status("error", "AI Analysis Failure")
+            state["error"] = "Analysis engine temporarily unavailable."
+
+        span.set_attribute("ats.reranked", len(scored))
+        jobs = [candidates[i] for i in scored]
+        if not jobs:
+            state["score"] = 0
+            return state
+
+        # 3. Metrics & best-match selection (drives the gap analysis)
+        for job in jobs:
+            if job["score"] >= threshold:
+                shortlist_counter.add(1, {"job_title": job.get("title") or "unknown"})
+
+        jobs.sort(key=lambda j: j["score"], reverse=True)
+        state["jobs"] = jobs
+        state["job"] = jobs[0]
+        state["score"] = jobs[0]["score"]
+        span.set_attribute("ats.score", state["score"])
+
+        return state
@@ -1,9 +1,14 @@
 import logging
 import json
-from typing import Dict, Any, List
-from pydantic import BaseModel, Field
+from contextlib import aclosing
+from typing import Dict, Any, List, Tuple
+from pydantic import BaseModel, Field, TypeAdapter
+from app.core.config import settings
 from app.core.observability import tracer
-from app.llm.router import LLMRouter  # Your custom hybrid router
+from app.llm.json_stream import JSONFieldStream
+from app.llm.router import llm_router  # Your custom hybrid router
+from app.services.llm_cache import exact_key, llm_cache, semantic_namespace
+from app.services.redis_cache import compute_once, get_cache
 
 
 # 1. Define the Structured Response Schema
@@ -22,8 +27,37 @@ class GapAnalysisResponse(BaseModel):
     )
 
 
-# Initialize the global router
-llm_router = LLMRouter()
+# Per-field validators, so a streamed response is checked member by member
+FIELD_VALIDATORS = {
+    name: TypeAdapter(field.annotation)
+    for name, field in GapAnalysisResponse.model_fields.items()
+}
+
+
+async def stream_gap_analysis(
+    prompt: str, system_instruction: str
+) -> Tuple[GapAnalysisResponse, str]:
+    """
+    Streams the LLM answer and validates each field as soon as it is complete.
+    A malformed field aborts the generation instead of waiting for the end.
+    Returns the analysis and the model that actually served it.
+    """
+    parser = JSONFieldStream()
+    fields: Dict[str, Any] = {}
+    async with aclosing(
+        llm_router.stream(
+            prompt=prompt, system_instruction=system_instruction, priority=True
+        )
+    ) as chunks:
+        async for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                validator = FIELD_VALIDATORS.get(key)
+                # Unknown keys are ignored, as model_validate would
+                fields[key] = validator.validate_python(value) if validator else value
+            if parser.closed:
+                # Ends the stream normally so the provider is credited
+                chunks.complete()
+    return GapAnalysisResponse.model_validate(fields), chunks.model
 
 
 async def gap_agent(state: Dict[str, Any]):
@@ -32,18 +66,16 @@ async def gap_agent(state: Dict[str, Any]):
     Orchestrates Hybrid LLM routing with forced Pydantic structured output.
     """
     resume = state.get("resume", "")
-    jd = state.get("job", {}).get("jd", "")
-    score = state.get("score", 0)
-
-    # Performance Optimization: Early exit
-    if score >= 90:
-        state["missing_skills"] = None
-        state["recommendation_status"] = "Perfect Match"
-        return state
+    # Without a sourced match (parallel branch), analyze against the target role
+    jd = (
+        state.get("job", {}).get("jd")
+        or f"Target role: {state.get('job_title', '')}"
+    )
+    # No score-based early exit: in the parallel graph this branch runs
+    # before (and without) the ATS score, so it always analyzes
 
     with tracer.start_as_current_span("GapAnalysisAgent") as span:
         span.set_attribute("agent.type", "gap_analyzer")
-        span.set_attribute("ats.score_incoming", score)
 
         try:
             # 2. Build the Professional Analysis Prompt
@@ -64,17 +96,59 @@ async def gap_agent(state: Dict[str, Any]):
                 + json.dumps(GapAnalysisResponse.model_json_schema())
             )
 
-            # 3. Execution via the Router (Priority=True uses Gemini, Fallback to Ollama)
-            with tracer.start_as_current_span("llm_reasoning_step") as llm_span:
-                raw_response = await llm_router.run(
-                    prompt=prompt, system_instruction=system_instruction, priority=True
+            # 3. Response cache: exact prompt first, then near-identical inputs
+            model = llm_router.model_for(priority=True)
+            cache_key = exact_key(model, system_instruction, prompt)
+            result = await get_cache(cache_key)
+            llm_cache.record("exact", result is not None)
+            vectors = None
+
+            if result is None:
+                namespace = semantic_namespace(model, system_instruction)
+                vectors = await llm_cache.embed_inputs([resume[:3000], jd[:3000]])
+                result = llm_cache.lookup_similar(namespace, vectors)
+                span.set_attribute("llm.cache", "semantic" if result else "miss")
+            else:
+                span.set_attribute("llm.cache", "exact")
+
+            if result is None:
+
+                async def generate() -> Dict[str, Any]:
+                    # 4. Execution via the Router (Priority=True uses Gemini,
+                    # Fallback to Ollama)
+                    with tracer.start_as_current_span("llm_reasoning_step") as llm_span:
+                        # 5. Parse & Validate Structured Output
+                        # Use Pydantic to ensure the 'contract' with the frontend is safe
+                        if settings.GAP_STREAMING:
+                            validated, served = await stream_gap_analysis(
+                                prompt, system_instruction
+                            )
+                        else:
+                            raw_response, served = await llm_router.run_with_model(
+                                prompt=prompt,
+                                system_instruction=system_instruction,
+                                priority=True,
+                            )
+                            validated = GapAnalysisResponse.model_validate_json(
+                                raw_response
+                            )
+                        llm_span.set_attribute("gap.count", len(validated.hard_skills))
+                        llm_span.set_attribute("llm.served_model", served)
+                        # Only validated responses reach either cache tier
+                        return {"model": served, "analysis": validated.model_dump()}
+
+                # Identical concurrent prompts share one LLM call. Fallback
+                # answers are used but never cached under the primary model.
+                result = await compute_once(
+                    cache_key,
+                    generate,
+                    ttl=settings.LLM_CACHE_TTL,
+                    should_cache=lambda value: value["model"] == model,
                 )
+                if result["model"] == model:
+                    llm_cache.remember(namespace, vectors, result)
 
-                # 4. Parse & Validate Structured Output
-                # Use Pydantic to ensure the 'contract' with the frontend is safe
-                parsed_data = GapAnalysisResponse.model_validate_json(raw_response)
-
-                llm_span.set_attribute("gap.count", len(parsed_data.hard_skills))
+            parsed_data = GapAnalysisResponse.model_validate(result["analysis"])
 
             # Update Global State
             state["missing_skills"] = parsed_data.model_dump()
@@ -1,19 +1,24 @@
-import os
 import asyncio
-from typing import Dict, Any, List
-from googleapiclient.discovery import build  # pip install google-api-python-client
+from typing import Dict, Any, List, Optional
+from app.core.config import settings
 from app.core.observability import tracer
-from app.services.redis_cache import get_cache, set_cache, generate_cache_key
+from app.services.learning_resources import build_provider_chain
+from app.services.redis_cache import (
+    mget_cache,
+    compute_once,
+    content_hash,
+    generate_cache_key,
+)
 
-# Configuration
-YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
-youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
+# Configuration: no network access at import time
+resource_provider = build_provider_chain()
+SKILL_CACHE_TTL = 604800  # 7 days
 
 
 async def pathfinder_agent(state: Dict[str, Any]):
     """
     Industry-level Learning Path Generator.
-    Integrates real-time YouTube search, Redis caching, and SigNoz tracing.
+    Integrates local/YouTube resource search, Redis caching, and SigNoz tracing.
     """
     gaps = state.get("missing_skills", {})
     # Normalize input from Gap Agent
@@ -31,65 +36,53 @@ async def pathfinder_agent(state: Dict[str, Any]):
         span.set_attribute("agent.type", "learning_pathfinder")
         span.set_attribute("skills.to_solve", len(missing_skills))
 
-        # 1. Hashed Cache Check
-        cache_key = generate_cache_key("learning_v2", ",".join(sorted(missing_skills)))
-        cached_path = get_cache(cache_key)
-        if cached_path:
-            span.set_attribute("cache.hit", True)
-            state["learning_path"] = cached_path
-            return state
+        # 1. Per-skill Cache Check (one round-trip for the whole list)
+        # Overlapping skill sets across users reuse each other's results
+        cache_keys = [
+            generate_cache_key("learning_skill_v1", content_hash(skill))
+            for skill in missing_skills
+        ]
+        path_items: List[Optional[Dict[str, Any]]] = await mget_cache(cache_keys)
+        pending = [i for i, item in enumerate(path_items) if item is None]
+        span.set_attribute("cache.hits", len(missing_skills) - len(pending))
 
-        span.set_attribute("cache.hit", False)
-        learning_path = []
+        # 2. Bounded Concurrent Search for the misses
+        if pending:
+            semaphore = asyncio.Semaphore(settings.PATHFINDER_CONCURRENCY)
 
-        # 2. Real-time Search Execution
-        for skill in missing_skills:
-            # We use a nested span with 'search' semantic conventions for SigNoz
-            with tracer.start_as_current_span(
-                "youtube_search_operation"
-            ) as search_span:
-                search_span.set_attribute("search.query", skill)
-                search_span.set_attribute("search.system", "youtube_v3")
-
-                try:
-                    # Industry standard: specifically search for 'full course' to improve quality
-                    query = f"{skill} masterclass full course 2026"
-
-                    # Run in thread pool if using synchronous google-api-client
-                    request = youtube.search().list(
-                        q=query, part="snippet", maxResults=1, type="video"
+            async def resolve(idx: int):
+                async with semaphore:
+                    skill = missing_skills[idx]
+                    # Failed searches return None and are not cached
+                    path_items[idx] = await compute_once(
+                        cache_keys[idx],
+                        lambda: _search_skill(skill),
+                        ttl=SKILL_CACHE_TTL,
                     )
-                    response = await asyncio.to_thread(request.execute)
 
-                    video_data = response.get("items", [{}])[0]
-                    video_id = video_data.get("id", {}).get("videoId")
+            await asyncio.gather(*(resolve(i) for i in pending))
 
-                    path_item = {
-                        "skill": skill,
-                        "resource_url": (
-                            f"https://www.youtube.com/watch?v={video_id}"
-                            if video_id
-                            else None
-                        ),
-                        "title": video_data.get("snippet", {}).get(
-                            "title", "Resource not found"
-                        ),
-                        "milestones": [
-                            f"Master {skill} fundamentals",
-                            f"Build a {skill} project",
-                            f"Optimize {skill} for production",
-                        ],
-                        "estimated_time": "12-15 hours",
-                    }
-                    learning_path.append(path_item)
+        # 3. Assemble in the Gap Agent's priority order
+        state["learning_path"] = [item for item in path_items if item]
 
-                except Exception as e:
-                    search_span.record_exception(e)
-                    search_span.set_status("error", "YouTube API failure")
-                    continue
+        return state
 
-        # 3. Persistence (7-day TTL)
-        set_cache(cache_key, learning_path, ttl=604800)
-        state["learning_path"] = learning_path
 
-        return state
+async def _search_skill(skill: str) -> Optional[Dict[str, Any]]:
+    """Finds one course for a skill via the provider chain (local -> YouTube)."""
+    resource = await resource_provider.search(skill)
+    if resource is None:
+        return None
+
+    return {
+        "skill": skill,
+        "resource_url": resource.get("resource_url"),
+        "title": resource.get("title", "Resource not found"),
+        "source": resource.get("source"),
+        "milestones": [
+            f"Master {skill} fundamentals",
+            f"Build a {skill} project",
+            f"Optimize {skill} for production",
+        ],
+        "estimated_time": "12-15 hours",
+    }
@@ -1,16 +1,25 @@
 import os
 from typing import Dict, Any, List
+from app.core.config import settings
 from app.core.observability import tracer
-from app.services.redis_cache import get_cache, set_cache, generate_cache_key
+from app.services.redis_cache import (
+    get_cache,
+    compute_once,
+    content_hash,
+    generate_cache_key,
+)
 from app.services.job_stream import fetch_jobs
 from app.services.weaviate_service import query_similar_jobs
+from app.services.job_indexer import job_indexer
+from app.services.local_index import get_local_index
 from app.api.schemas import ResumeData
 
 
 async def sourcing_agent(state: Dict[str, Any]):
     """
     Industry-grade Sourcing Agent with Structured Data Intelligence.
-    Logic: Redis Cache -> Weaviate Semantic Skill-Match -> External API Fallback.
+    Logic: Redis Cache -> Weaviate Semantic Skill-Match -> Local Vector Index
+    -> External API Fallback.
     """
     # Extract inputs and structured resume data
     title = state.get("job_title")
@@ -27,8 +36,10 @@ async def sourcing_agent(state: Dict[str, Any]):
         span.set_attribute("search.skills_count", len(skills))
 
         # 1. Level 1: Redis Cache (Speed Layer)
-        cache_key = generate_cache_key("jobs_v3", title, location, skills_query[:50])
-        cached_jobs = get_cache(cache_key)
+        cache_key = generate_cache_key(
+            "jobs_v4", content_hash(title, location, skills_query)
+        )
+        cached_jobs = await get_cache(cache_key)
 
         if cached_jobs:
             span.set_attribute("data.source", "redis_cache")
@@ -38,10 +49,12 @@ async def sourcing_agent(state: Dict[str, Any]):
         # 2. Level 2: Weaviate Semantic Vector Search (Precision Layer)
         # We query using both the Job Title and the actual parsed skills
         with tracer.start_as_current_span("weaviate_skill_matching") as v_span:
+            # Stage one of retrieve-then-rerank: a wide, cheap candidate set
             internal_jobs = await query_similar_jobs(
                 title=title,
                 location=location,
                 skills=skills,  # Passing structured skills to Weaviate
+                limit=settings.RETRIEVAL_TOP_K,
             )
 
             if internal_jobs and len(internal_jobs) >= 3:
@@ -50,16 +63,34 @@ async def sourcing_agent(state: Dict[str, Any]):
                 state["jobs"] = internal_jobs
                 return state
 
+        # 2b. Local In-Process Index (keeps latency bounded during Weaviate incidents)
+        local_index = await get_local_index()
+        if local_index is not None:
+            local_jobs = await local_index.query_similar_jobs(
+                title=title,
+                location=location,
+                skills=skills,
+                limit=settings.RETRIEVAL_TOP_K,
+            )
+            if len(local_jobs) >= 3:
+                span.set_attribute("data.source", "local_vector_index")
+                state["jobs"] = local_jobs
+                return state
+
         # 3. Level 3: External API (Freshness Layer)
         try:
             with tracer.start_as_current_span("external_api_fetch") as api_span:
-                # Fallback to streaming if our internal database has no matches
-                jobs = await fetch_jobs(title, location)
+                # Fallback to streaming if our internal database has no matches.
+                # Concurrent misses on a trending title share one upstream call,
+                # and the result is cached for 30 minutes.
+                jobs = await compute_once(
+                    cache_key, lambda: fetch_jobs(title, location), ttl=1800
+                )
                 span.set_attribute("jobs.found", len(jobs))
                 span.set_attribute("data.source", "external_api_fallback")
 
-            # Cache the new results for 30 minutes
-            set_cache(cache_key, jobs, ttl=1800)
+            # Warm the vector layer in the background for the next request
+            job_indexer.enqueue(jobs)
             state["jobs"] = jobs
 
         except Exception as e:
@@ -1,6 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
-from app.orchestration.career_graph import run_graph
+import json
+from typing import List
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.orchestration.career_graph import run_graph, stream_graph
+from app.services.analysis_queue import analysis_queue, QueueFullError
+from app.services.bulk_resume_import import import_resumes
 from app.api.schemas import AnalyzeRequest
+from app.core.config import settings
 from app.core.observability import tracer
 import logging
 
@@ -47,3 +54,125 @@ async def analyze(req: AnalyzeRequest):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An internal error occurred while processing your career analysis.",
             )
+
+
+@router.post("/analyze/stream", status_code=status.HTTP_200_OK)
+async def analyze_stream(req: AnalyzeRequest):
+    """
+    Streaming variant of /analyze (Server-Sent Events).
+    Emits one event per completed node (parse, source, score, gap, path)
+    followed by a final `done` event. If the client disconnects, the
+    generator is cancelled and the remaining agents stop with it.
+    """
+    logger.info(f"Starting streamed analysis for {req.job_title} in {req.location}")
+
+    async def event_stream():
+        with tracer.start_as_current_span("CareerIntelligenceStream") as span:
+            span.set_attribute("user.job_title", req.job_title)
+            span.set_attribute("user.location", req.location)
+            try:
+                async for node_name, update in stream_graph(req.model_dump()):
+                    update.pop("resume_bytes", None)
+                    payload = json.dumps(jsonable_encoder(update))
+                    yield f"event: {node_name}\ndata: {payload}\n\n"
+                yield "event: done\ndata: {}\n\n"
+
+            except Exception as e:
+                span.record_exception(e)
+                span.set_status("error", str(e))
+                logger.error(f"Streamed workflow failed: {str(e)}")
+                detail = "An internal error occurred while processing your career analysis."
+                error = json.dumps({"detail": detail})
+                yield f"event: error\ndata: {error}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/analyze/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis(
+    req: AnalyzeRequest,
+    priority: int = Query(5, ge=0, le=9, description="0 runs first"),
+):
+    """
+    Asynchronous submission: returns a job id immediately and runs the
+    analysis on the local worker pool. Poll GET /analyze/jobs/{job_id}.
+    Re-submitting the same resume + role returns the existing job.
+    """
+    with tracer.start_as_current_span("CareerIntelligenceSubmit") as span:
+        span.set_attribute("user.job_title", req.job_title)
+        span.set_attribute("analysis.priority", priority)
+        try:
+            record = await analysis_queue.submit(req.model_dump(), priority=priority)
+        except QueueFullError:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Analysis queue is full. Please retry shortly.",
+                headers={"Retry-After": "10"},
+            )
+
+        span.set_attribute("analysis.job_id", record["id"])
+        return {"job_id": record["id"], "status": record["status"]}
+
+
+@router.get("/analyze/jobs/{job_id}", status_code=status.HTTP_200_OK)
+async def get_analysis(job_id: str):
+    """Polls a queued analysis: queued | running | done (with result) | failed."""
+    record = await analysis_queue.get(job_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Unknown analysis job."
+        )
+    return record
+
+
+def _bulk_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload too large. Max is {settings.BULK_MAX_BYTES // 2**20}MB total.",
+    )
+
+
+@router.post("/resumes/bulk", status_code=status.HTTP_200_OK)
+async def bulk_parse_resumes(files: List[UploadFile] = File(...)):
+    """
+    Bulk resume import for recruiters.
+    Streams one JSON line per resume as soon as its batch is parsed:
+    {source, sha256, status: ok | error, resume, error}. Several resumes
+    share each extraction request, under the same LLM quota as /analyze.
+    """
+    logger.info(f"Starting bulk resume import of {len(files)} files")
+    if len(files) > settings.BULK_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many files. Max is {settings.BULK_MAX_FILES} per request.",
+        )
+    # Reject on declared sizes before reading anything into memory
+    if sum(upload.size or 0 for upload in files) > settings.BULK_MAX_BYTES:
+        raise _bulk_too_large()
+
+    # Read uploads before responding: form files may close once we return
+    docs, total = [], 0
+    for upload in files:
+        file_bytes = await upload.read()
+        total += len(file_bytes)
+        if total > settings.BULK_MAX_BYTES:
+            raise _bulk_too_large()  # Undeclared sizes: stop as soon as exceeded
+        docs.append((upload.filename, file_bytes))
+
+    async def record_stream():
+        with tracer.start_as_current_span("BulkResumeImport") as span:
+            span.set_attribute("bulk.files", len(docs))
+            try:
+                async for record in import_resumes(docs):
+                    yield json.dumps(jsonable_encoder(record)) + "\n"
+            except Exception as e:
+                span.record_exception(e)
+                span.set_status("error", str(e))
+                logger.error(f"Bulk resume import failed: {str(e)}")
+                yield json.dumps({"status": "error", "error": "Import aborted."}) + "\n"
+
+    return StreamingResponse(record_stream(), media_type="application/x-ndjson")
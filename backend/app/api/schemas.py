@@ -24,6 +24,28 @@ class AnalyzeRequest(BaseModel):
     )
 
 
+# --- Structured Resume (LLM extraction target) ---
+
+
+class ResumeData(BaseModel):
+    """Structured resume produced by the instructor-based parser."""
+
+    name: Optional[str] = Field(default=None, description="Candidate's full name.")
+    email: Optional[str] = Field(default=None, description="Contact email.")
+    skills: List[str] = Field(
+        default_factory=list, description="Technical and soft skills, as listed."
+    )
+    job_titles: List[str] = Field(
+        default_factory=list, description="Roles held, most recent first."
+    )
+    experience_years: Optional[float] = Field(
+        default=None, description="Total years of professional experience."
+    )
+    education: List[str] = Field(
+        default_factory=list, description="Degrees and certifications."
+    )
+
+
 # --- Internal State Model (for LangGraph) ---
 
 
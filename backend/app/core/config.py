@@ -15,11 +15,115 @@ class Settings(BaseSettings):
 
     # LLM Configuration
     GEMINI_API_KEY: str
+    GEMINI_MODEL: str = "gemini-1.5-flash"
     OLLAMA_URL: str = "http://localhost:11434"
 
     # Infrastructure URLs
     REDIS_URL: str = "redis://localhost:6379"
     WEAVIATE_URL: str = "http://localhost:8080"
+    WEAVIATE_GRPC_PORT: int = 50051
+    WEAVIATE_QUERY_TIMEOUT_S: int = 2  # Fall through to the API, don't stall
+    WEAVIATE_ALPHA: float = 0.75  # Heavily weight semantic similarity
+    WEAVIATE_LIMIT: int = 5
+    JOB_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    JOB_EMBED_BATCH_SIZE: int = 64  # Texts per bi-encoder forward pass
+    JOB_INDEX_BATCH_SIZE: int = 64  # Objects per Weaviate batch upsert
+    JOB_INDEX_CONCURRENCY: int = 2  # Parallel upsert batches
+    JOB_INDEX_QUEUE_SIZE: int = 256  # Pending background batches per worker
+    JOB_INDEX_DEDUP_CACHE: int = 10000  # Recently indexed content hashes
+    LOCAL_INDEX_ENABLED: bool = True  # In-process fallback when Weaviate fails
+    LOCAL_INDEX_DIR: str = "/app/data/job_index"  # Memory-mapped vectors
+
+    # Cache
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_TIMEOUT_MS: int = 250  # Slow Redis behaves like a miss
+    L1_CACHE_MAX_ENTRIES: int = 2048  # In-process LRU in front of Redis
+    L1_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    L1_CACHE_MAX_TTL: int = 300  # Bounds staleness across workers
+    CACHE_CODEC: str = "orjson"  # orjson | msgpack | json
+    CACHE_COMPRESSION: str = "zstd"  # zstd | lz4 | zlib | none
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+
+    # ML Inference
+    ATS_MODEL_NAME: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    ATS_BACKEND: str = "torch"  # torch | onnx | onnx-int8
+    ATS_ONNX_DIR: str = "/app/models/ats-onnx"
+    ATS_ONNX_THREADS: int = 1
+    ATS_PARITY_CHECK: bool = True  # Verify non-torch backends once per export
+    ATS_PARITY_TOLERANCE: float = 0.05  # Max abs score drift (0-1 scale)
+    ATS_BATCH_SIZE: int = 16  # Pairs per cross-encoder forward pass
+    ATS_INFERENCE_THREADS: int = 1  # Torch already parallelizes each pass
+    ATS_MAX_BATCH: int = 32  # Micro-batch flush size across requests
+    ATS_MAX_WAIT_MS: int = 5  # Micro-batch flush deadline
+    ATS_CACHE_TTL: int = 604800  # Content-addressed keys make long TTLs safe
+    ATS_SHORTLIST_THRESHOLD: int = 80
+
+    # Retrieve-then-rerank
+    RETRIEVAL_TOP_K: int = 50  # Stage one: cheap hybrid/bi-encoder candidates
+    RERANK_TOP_M: int = 20  # Stage two: max candidates sent to the cross-encoder
+    RERANK_BATCH_SIZE: int = 8  # Cross-encoder pairs per rerank step
+    RERANK_SHORTLIST_TARGET: int = 5  # Stop once this many clear the threshold
+
+    # Job Sourcing
+    JOB_STREAM_DEADLINE_MS: int = 4000  # Return what we have after this
+    JOB_STREAM_MAX_JOBS: int = 20  # Cap across all providers
+
+    # Learning Paths
+    PATHFINDER_CONCURRENCY: int = 4  # Parallel resource lookups per request
+    LEARNING_PROVIDERS: str = "local,youtube"  # Fallback chain, in order
+    LEARNING_INDEX_PATH: str = "/app/data/courses.db"  # SQLite FTS5 index
+
+    # LLM Routing. Quotas are account-wide; each of the WEB_CONCURRENCY
+    # gunicorn workers enforces its own share (limit / WEB_CONCURRENCY)
+    WEB_CONCURRENCY: int = 4  # Same env var gunicorn.conf.py reads
+    GEMINI_RPM: int = 15  # Free tier; 0 = unlimited
+    GEMINI_TPM: int = 1_000_000
+    GEMINI_CONCURRENCY: int = 4  # In-flight Gemini calls
+    OLLAMA_CONCURRENCY: int = 2  # Local model serves few calls at once
+    LLM_BREAKER_FAILURES: int = 3  # Consecutive failures that open the circuit
+    LLM_BREAKER_COOLDOWN_S: float = 30.0  # Open time before a probe call
+    LLM_HEDGE_ENABLED: bool = False  # Fire the fallback when the primary is slow
+    LLM_HEDGE_PERCENTILE: float = 95.0  # Primary latency percentile to wait for
+    LLM_HEDGE_MIN_DELAY_S: float = 1.0
+    LLM_HEDGE_DEFAULT_DELAY_S: float = 8.0  # Until enough latency samples exist
+    # Streaming validates gap fields as they arrive and aborts bad generations
+    # early, but bypasses the router's hedged call: with it on, the gap agent
+    # never hedges even when LLM_HEDGE_ENABLED is set.
+    GAP_STREAMING: bool = False
+
+    # LLM Response Cache
+    LLM_CACHE_TTL: int = 604800  # Exact tier: same model + prompt, same answer
+    LLM_SEMANTIC_CACHE_ENABLED: bool = False  # Reuse answers for near-identical inputs
+    LLM_SEMANTIC_THRESHOLD: float = 0.97  # Min cosine for every input (resume, JD)
+    LLM_SEMANTIC_CACHE_MAX_ENTRIES: int = 2048  # Per worker, LRU-evicted
+    LLM_SEMANTIC_CACHE_TTL: int = 86400
+
+    # Orchestration: per-node budgets (seconds) inside the request deadline
+    PARSE_NODE_TIMEOUT_S: float = 30.0
+    SOURCE_NODE_TIMEOUT_S: float = 8.0
+    SCORE_NODE_TIMEOUT_S: float = 10.0
+    GAP_NODE_TIMEOUT_S: float = 30.0
+    PATH_NODE_TIMEOUT_S: float = 10.0
+
+    # Async Analysis Queue
+    ANALYSIS_WORKERS: int = 2  # Concurrent queued analyses per process
+    ANALYSIS_QUEUE_SIZE: int = 100  # Beyond this, submits get 429
+    ANALYSIS_RESULT_TTL: int = 86400  # Status/result retention for polling
+    ANALYSIS_HEARTBEAT_S: float = 10.0  # Lease renewal for queued/running jobs
+    ANALYSIS_LEASE_S: int = 60  # Unrenewed this long = owner died, resubmit retakes
+
+    # Resume Parsing
+    PDF_WORKERS: int = 2  # Extraction processes per API worker
+    PDF_TIMEOUT_S: float = 15.0  # Per-document extraction budget
+    PDF_MAX_PAGES: int = 20  # Pages beyond this are ignored
+
+    # Bulk Resume Import
+    BULK_BATCH_SIZE: int = 5  # Resumes per structured-extraction request
+    BULK_BATCH_MAX_CHARS: int = 30000  # Resume text per batched request
+    BULK_CONCURRENCY: int = 2  # Batched requests in flight (quota still applies)
+    BULK_CHUNK_SIZE: int = 50  # Documents read and extracted per pass
+    BULK_MAX_FILES: int = 200  # Files per /resumes/bulk request
+    BULK_MAX_BYTES: int = 100 * 1024 * 1024  # Total upload per request
 
     # Observability
     SIGNOZ_ENDPOINT: str = "http://localhost:4317"
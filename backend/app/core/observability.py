@@ -12,39 +12,66 @@ from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExp
 SIGNOZ_ENDPOINT = os.getenv("SIGNOZ_ENDPOINT", "http://localhost:4317")
 ENV = os.getenv("ENV", "production")
 
-# 1. Identity: The 'Resource' defines who is sending the data
-resource = Resource.create(
-    {
-        "service.name": "nexus-talent-api",
-        "deployment.environment": ENV,
-        "version": "1.0.0",
-    }
-)
+# Global proxies: usable at import time, they start exporting once
+# setup_telemetry() installs the real providers in this process.
+tracer = trace.get_tracer("nexus-talent-tracer")
+meter = metrics.get_meter("nexus-talent-metrics")
 
-# --- PILLAR 1: TRACING (The Timeline of Events) ---
-tracer_provider = TracerProvider(resource=resource)
-trace.set_tracer_provider(tracer_provider)
+_configured_pid = None
+_providers = ()
 
-# Use OTLP (gRPC) for SigNoz - much faster than HTTP or Console logging
-span_exporter = OTLPSpanExporter(endpoint=SIGNOZ_ENDPOINT, insecure=True)
-tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
 
-# Shared Tracer instance
-tracer = trace.get_tracer("nexus-talent-tracer")
+def setup_telemetry(span_exporter=None, metric_exporter=None):
+    """
+    Builds the tracer/meter providers and their OTLP exporters, once per process.
+    Exporter threads and gRPC channels do not survive fork(), so this runs in
+    each worker (gunicorn post_fork, or the app lifespan), never in a
+    preloading master. Exporters can be injected for tests.
+    """
+    global _configured_pid, _providers
+    if _configured_pid == os.getpid():
+        return
+    _configured_pid = os.getpid()
 
+    # 1. Identity: The 'Resource' defines who is sending the data
+    resource = Resource.create(
+        {
+            "service.name": "nexus-talent-api",
+            "deployment.environment": ENV,
+            "version": "1.0.0",
+        }
+    )
 
-# --- PILLAR 2: METRICS (The Quantitative Data) ---
-# Exporting metrics via OTLP to SigNoz (Replaces local Prometheus reader)
-metric_exporter = OTLPMetricExporter(endpoint=SIGNOZ_ENDPOINT, insecure=True)
-metric_reader = PeriodicExportingMetricReader(
-    metric_exporter, export_interval_millis=15000
-)
+    # --- PILLAR 1: TRACING (The Timeline of Events) ---
+    tracer_provider = TracerProvider(resource=resource)
+    # Use OTLP (gRPC) for SigNoz - much faster than HTTP or Console logging
+    span_exporter = span_exporter or OTLPSpanExporter(
+        endpoint=SIGNOZ_ENDPOINT, insecure=True
+    )
+    tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(tracer_provider)
 
-meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
-metrics.set_meter_provider(meter_provider)
+    # --- PILLAR 2: METRICS (The Quantitative Data) ---
+    # Exporting metrics via OTLP to SigNoz (Replaces local Prometheus reader)
+    metric_exporter = metric_exporter or OTLPMetricExporter(
+        endpoint=SIGNOZ_ENDPOINT, insecure=True
+    )
+    metric_reader = PeriodicExportingMetricReader(
+        metric_exporter, export_interval_millis=15000
+    )
+    meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
+    metrics.set_meter_provider(meter_provider)
+
+    _providers = (tracer_provider, meter_provider)
+
+
+def shutdown_telemetry():
+    """Flushes pending spans/metrics and stops the exporter threads."""
+    global _providers
+    for provider in _providers:
+        provider.shutdown()
+    _providers = ()
 
-# Shared Meter instance
-meter = metrics.get_meter("nexus-talent-metrics")
 
 # --- GLOBAL COUNTERS ---
 # Business Metric: Shortlisting Success
@@ -52,7 +79,7 @@ shortlist_counter = meter.create_counter(
     "ats_shortlisted_total", description="Total candidates who scored > 80%"
 )
 
-# Infrastructure Metrics: Cache Performance
+# Infrastructure Metrics: Cache Performance (L2 = Redis)
 cache_hit_counter = meter.create_counter(
     name="cache_hits_total",
     description="Total number of Redis cache hits",
@@ -61,3 +88,38 @@ cache_miss_counter = meter.create_counter(
     name="cache_misses_total",
     description="Total number of Redis cache misses",
 )
+
+# L1 = in-process LRU in front of Redis
+l1_cache_hit_counter = meter.create_counter(
+    name="l1_cache_hits_total",
+    description="Total number of in-process (L1) cache hits",
+)
+l1_cache_miss_counter = meter.create_counter(
+    name="l1_cache_misses_total",
+    description="Total number of in-process (L1) cache misses",
+)
+cache_coalesced_counter = meter.create_counter(
+    name="cache_coalesced_total",
+    description="Cache misses served by another request's in-flight computation",
+)
+
+# LLM response cache (tier = exact | semantic)
+llm_cache_hit_counter = meter.create_counter(
+    name="llm_cache_hits_total",
+    description="LLM calls answered from the response cache",
+)
+llm_cache_miss_counter = meter.create_counter(
+    name="llm_cache_misses_total",
+    description="LLM response cache lookups that fell through",
+)
+
+# LLM routing decisions (outcome = success | error | skipped | hedged)
+llm_route_counter = meter.create_counter(
+    name="llm_route_total",
+    description="LLM routing decisions per provider, outcome and reason",
+)
+llm_latency_histogram = meter.create_histogram(
+    name="llm_call_latency_ms",
+    unit="ms",
+    description="Latency of successful LLM calls per provider",
+)
@@ -1,8 +1,43 @@
 import re
+import sys
 import html
+from typing import Iterable, Union
 from fastapi import HTTPException, status
 
 
+def _non_printable_class(first: int, last: int) -> str:
+    """Regex character class body of code points where str.isprintable() is False."""
+    ranges, start = [], None
+    for cp in range(first, last + 1):
+        printable = chr(cp).isprintable()
+        if not printable and start is None:
+            start = cp
+        elif printable and start is not None:
+            ranges.append((start, cp - 1))
+            start = None
+    if start is not None:
+        ranges.append((start, last))
+    return "".join(
+        re.escape(chr(a)) if a == b else f"{re.escape(chr(a))}-{re.escape(chr(b))}"
+        for a, b in ranges
+    )
+
+
+# Precompiled once per process; the passes below run in C.
+# A BMP-only class compiles to a constant-time bitmap lookup; astral ranges
+# would degrade it to a linear range scan, so astral runs (rare: emoji,
+# tag characters) are matched separately and filtered per run.
+_NON_PRINTABLE_BMP = re.compile(f"[{_non_printable_class(0, 0xFFFF)}]+")
+_ASTRAL_RUN = re.compile(f"[{chr(0x10000)}-{chr(sys.maxunicode)}]+")
+
+
+_ASCII_NON_PRINTABLE = bytes(range(0x20)) + b"\x7f"
+
+
+def _printable_only(match: re.Match) -> str:
+    return "".join(char for char in match.group() if char.isprintable())
+
+
 class SecurityManager:
     """
     Centralized security logic for sanitizing resume inputs
@@ -10,19 +45,47 @@ class SecurityManager:
     """
 
     @staticmethod
-    def sanitize_input(text: str) -> str:
+    def sanitize_input(text: Union[str, Iterable[str]]) -> str:
         """
         Cleans raw resume or JD text to prevent XSS or prompt injection artifacts.
+        Accepts a string or an iterable of chunks (e.g. PDF pages).
         """
         if not text:
             return ""
+        chunks = (text,) if isinstance(text, str) else text
+
+        pieces = []
+        pending_space = False  # Whitespace runs may span chunk boundaries
+        for chunk in chunks:
+            cleaned = SecurityManager._strip_chunk(chunk)
+            # 3. Limit whitespace to prevent token bloat (split() also strips)
+            core = " ".join(cleaned.split())
+            if not core:
+                pending_space = pending_space or bool(cleaned)
+                continue
+            if pieces and (pending_space or cleaned[0] == " "):
+                pieces.append(" ")
+            pieces.append(core)
+            pending_space = cleaned[-1] == " "
+
+        return "".join(pieces)
+
+    @staticmethod
+    def _strip_chunk(text: str) -> str:
         # 1. Strip HTML tags
         clean_text = html.escape(text)
-        # 2. Remove non-printable characters
-        clean_text = "".join(char for char in clean_text if char.isprintable())
-        # 3. Limit whitespace to prevent token bloat
-        clean_text = re.sub(r"\s+", " ", clean_text).strip()
+        # 2. Remove non-printable characters (no-op fast path for clean text).
+        # Afterwards the only whitespace left is " ", so split() == \s+.
+        if clean_text.isprintable():
+            return clean_text
+        if clean_text.isascii():
+            # Byte-level delete of C0 controls + DEL
+            raw = clean_text.encode("ascii")
+            return raw.translate(None, _ASCII_NON_PRINTABLE).decode("ascii")
 
+        clean_text = _NON_PRINTABLE_BMP.sub("", clean_text)
+        if not clean_text.isprintable():
+            clean_text = _ASTRAL_RUN.sub(_printable_only, clean_text)
         return clean_text
 
     @staticmethod
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class BaseLLM(ABC):
@@ -6,3 +7,12 @@ class BaseLLM(ABC):
     async def generate(self, prompt: str, system_instruction: str = "") -> str:
         """Standard interface for all LLM calls."""
         pass
+
+    async def generate_stream(
+        self, prompt: str, system_instruction: str = ""
+    ) -> AsyncIterator[str]:
+        """
+        Yields the response text in chunks as it is generated.
+        Providers without streaming yield the full response once.
+        """
+        yield await self.generate(prompt, system_instruction)
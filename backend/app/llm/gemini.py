@@ -1,23 +1,59 @@
-import os
+from functools import lru_cache
+from typing import AsyncIterator
+
 import google.generativeai as genai
 from app.llm.base import BaseLLM
+from app.core.config import settings
 from app.core.observability import tracer
 
+# Gemini output is always requested as JSON
+GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+
+@lru_cache(maxsize=1)
+def configure_gemini():
+    """Configures the SDK once per process (API key, transport)."""
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+
+
+@lru_cache(maxsize=32)
+def get_model(model_name: str, system_instruction: str = "") -> genai.GenerativeModel:
+    """
+    Shared GenerativeModel per (model, system instruction).
+    Agents use a handful of fixed instructions, so this stays small and
+    every call after the first skips model construction.
+    """
+    configure_gemini()
+    return genai.GenerativeModel(
+        model_name=model_name, system_instruction=system_instruction or None
+    )
+
 
 class GeminiLLM(BaseLLM):
-    def __init__(self):
+    def __init__(self, model_name: str = None):
         # Gemini 1.5 Flash is currently free (15 RPM / 1M TPM)
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        self.model_name = "gemini-1.5-flash"
+        configure_gemini()
+        self.model_name = model_name or settings.GEMINI_MODEL
 
     async def generate(self, prompt: str, system_instruction: str = "") -> str:
         with tracer.start_as_current_span("gemini_flash_call") as span:
             span.set_attribute("llm.model", self.model_name)
-            model = genai.GenerativeModel(
-                model_name=self.model_name, system_instruction=system_instruction
-            )
+            model = get_model(self.model_name, system_instruction)
             # asynchronous generation for FastAPI performance
             response = await model.generate_content_async(
-                prompt, generation_config={"response_mime_type": "application/json"}
+                prompt, generation_config=GENERATION_CONFIG
             )
             return response.text
+
+    async def generate_stream(
+        self, prompt: str, system_instruction: str = ""
+    ) -> AsyncIterator[str]:
+        # Not made current: the context would span the consumer's awaits
+        with tracer.start_span("gemini_flash_stream") as span:
+            span.set_attribute("llm.model", self.model_name)
+            model = get_model(self.model_name, system_instruction)
+            response = await model.generate_content_async(
+                prompt, generation_config=GENERATION_CONFIG, stream=True
+            )
+            async for chunk in response:
+                yield chunk.text
@@ -0,0 +1,65 @@
+import json
+from typing import Any, List, Tuple
+
+
+class JSONFieldStream:
+    """
+    Incremental parser for a streamed top-level JSON object.
+    feed() returns each (key, value) member as soon as its value is complete,
+    so callers can validate fields while the model is still generating and
+    abandon a bad generation early. Text before the opening brace (e.g. a
+    markdown fence) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self.closed = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        members = []
+        for char in chunk:
+            if self.closed:
+                break
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._buffer.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+
+            if self._depth == 1 and char == ",":
+                members.append(self._flush())
+            elif self._depth == 0:
+                self.closed = True
+                if "".join(self._buffer).strip():
+                    members.append(self._flush())
+            else:
+                self._buffer.append(char)
+        return members
+
+    def _flush(self) -> Tuple[str, Any]:
+        member = "".join(self._buffer)
+        self._buffer = []
+        # A lone `"key": value` member parses as a one-key object
+        ((key, value),) = json.loads("{" + member + "}").items()
+        return key, value
@@ -0,0 +1,108 @@
+import time
+from collections import deque
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter: `capacity` units refilled evenly over `period`
+    seconds (e.g. 15 requests per 60s). Non-blocking: callers that cannot
+    take tokens route elsewhere instead of waiting.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        refill = (now - self._updated) * self.rate
+        self._tokens = min(self.capacity, self._tokens + refill)
+        self._updated = now
+
+    def available(self, amount: float = 1.0) -> bool:
+        self._refill()
+        # A request larger than the whole bucket is admitted once it is full
+        return self._tokens >= min(amount, self.capacity)
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        self._refill()
+        missing = min(amount, self.capacity) - self._tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float = 1.0):
+        self._refill()
+        self._tokens -= amount
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `cooldown` seconds; then lets a single probe through (half-open).
+    A successful probe closes it, a failed one re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def release_probe(self):
+        """Frees a half-open probe slot that was claimed but never used."""
+        self._probing = False
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+
+class LatencyWindow:
+    """Recent successful call latencies, for hedging delays."""
+
+    def __init__(self, size: int = 100):
+        self._samples = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float, min_samples: int = 20) -> Optional[float]:
+        if len(self._samples) < min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
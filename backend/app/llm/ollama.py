@@ -1,7 +1,10 @@
-import httpx
+import json
 import os
+from typing import AsyncIterator
+
 from app.llm.base import BaseLLM
 from app.core.observability import tracer
+from app.services.http_clients import http_clients
 
 
 class OllamaLLM(BaseLLM):
@@ -14,9 +17,36 @@ class OllamaLLM(BaseLLM):
             span.set_attribute("llm.model", self.model)
             full_prompt = f"{system_instruction}\n\n{prompt}"
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    self.url,
-                    json={"model": self.model, "prompt": full_prompt, "stream": False},
-                )
-                return response.json().get("response", "")
+            client = http_clients.get("ollama")
+            response = await client.post(
+                self.url,
+                json={"model": self.model, "prompt": full_prompt, "stream": False},
+            )
+            return response.json().get("response", "")
+
+    async def generate_stream(
+        self, prompt: str, system_instruction: str = ""
+    ) -> AsyncIterator[str]:
+        # Not made current: the context would span the consumer's awaits
+        with tracer.start_span("ollama_local_stream") as span:
+            span.set_attribute("llm.model", self.model)
+            full_prompt = f"{system_instruction}\n\n{prompt}"
+
+            client = http_clients.get("ollama")
+            # Newline-delimited JSON: {"response": "...", "done": bool} per line
+            async with client.stream(
+                "POST",
+                self.url,
+                json={"model": self.model, "prompt": full_prompt, "stream": True},
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event.get("error"):
+                        raise RuntimeError(f"Ollama stream error: {event['error']}")
+                    if event.get("response"):
+                        yield event["response"]
+                    if event.get("done"):
+                        break
@@ -1,28 +1,404 @@
+import asyncio
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.llm.base import BaseLLM
 from app.llm.gemini import GeminiLLM
 from app.llm.ollama import OllamaLLM
-from app.core.observability import tracer
+from app.llm.limits import CircuitBreaker, LatencyWindow, TokenBucket
+from app.core.config import settings
+from app.core.observability import llm_latency_histogram, llm_route_counter, tracer
 import logging
 
+# Output tokens reserved per call on top of the prompt estimate
+RESERVED_OUTPUT_TOKENS = 1024
+
+
+class LLMUnavailableError(RuntimeError):
+    """Every provider in the chain was rate-limited, open-circuited or failed."""
+
+
+def estimate_tokens(prompt: str, system_instruction: str = "") -> int:
+    """Cheap token estimate (~4 chars/token) for TPM budgeting."""
+    return (len(prompt) + len(system_instruction)) // 4 + RESERVED_OUTPUT_TOKENS
+
+
+def _worker_bucket(account_limit: int) -> Optional[TokenBucket]:
+    """
+    Per-process share of an account-wide per-minute quota. Buckets are not
+    shared between gunicorn workers, so each one gets limit / WEB_CONCURRENCY.
+    """
+    if not account_limit:
+        return None
+    return TokenBucket(account_limit / max(1, settings.WEB_CONCURRENCY))
+
+
+@dataclass
+class ProviderGate:
+    """
+    Admission control for one provider: RPM/TPM buckets (None = unlimited),
+    a concurrency cap, a circuit breaker and a latency window for hedging.
+    """
+
+    name: str
+    llm: BaseLLM
+    model: str  # Identity of the answers this provider serves
+    concurrency: int
+    rpm: Optional[TokenBucket] = None
+    tpm: Optional[TokenBucket] = None
+    breaker: CircuitBreaker = field(
+        default_factory=lambda: CircuitBreaker(
+            settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_COOLDOWN_S
+        )
+    )
+    latency: LatencyWindow = field(default_factory=LatencyWindow)
+
+    def __post_init__(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def admit(self, tokens: int, last_resort: bool = False) -> Optional[str]:
+        """
+        Reserves quota and a concurrency slot for one call; returns the
+        rejection reason, if any. On success the caller owns the slot and
+        must release() it. Only the last resort waits for a slot.
+        """
+        if not self.breaker.allow():
+            return "circuit_open"
+        reason = None
+        if not last_resort:
+            if self.semaphore.locked():
+                reason = "saturated"
+            elif (self.rpm and not self.rpm.available(1)) or (
+                self.tpm and not self.tpm.available(tokens)
+            ):
+                reason = "rate_limited"
+        if reason:
+            # Don't leave a half-open probe slot claimed for a call never made
+            self.breaker.release_probe()
+            return reason
+        try:
+            # Nothing awaited since locked() was checked, so unless this is
+            # the last resort the acquire completes without suspending
+            await self.semaphore.acquire()
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        if self.rpm:
+            self.rpm.take(1)
+        if self.tpm:
+            self.tpm.take(tokens)
+        return None
+
+    def release(self):
+        self.semaphore.release()
+
+    async def acquire(self, tokens: int):
+        """
+        Blocking admission for batch work: waits for bucket capacity, for an
+        open circuit to cool down and for a slot, instead of routing
+        elsewhere. The caller must release() the slot.
+        """
+        while True:
+            if self.breaker.allow():
+                wait = max(
+                    self.rpm.wait_time(1) if self.rpm else 0.0,
+                    self.tpm.wait_time(tokens) if self.tpm else 0.0,
+                )
+                if wait <= 0:
+                    if self.rpm:
+                        self.rpm.take(1)
+                    if self.tpm:
+                        self.tpm.take(tokens)
+                    try:
+                        await self.semaphore.acquire()
+                    except asyncio.CancelledError:
+                        self.breaker.release_probe()
+                        raise
+                    return
+                self.breaker.release_probe()
+            else:
+                wait = self.breaker.retry_after()
+            # Floor avoids spinning while another caller holds the probe
+            await asyncio.sleep(max(wait, 0.1))
+
+    def hedge_delay(self) -> float:
+        p = self.latency.percentile(settings.LLM_HEDGE_PERCENTILE)
+        if p is None:
+            return settings.LLM_HEDGE_DEFAULT_DELAY_S
+        return max(p, settings.LLM_HEDGE_MIN_DELAY_S)
+
 
 class LLMRouter:
+    """
+    Industry-grade LLM routing.
+    Priority calls go to Gemini (free tier: 15 RPM / 1M TPM), others to local
+    Ollama. Client-side buckets route around the quota *before* a request
+    would fail, breakers stop hammering a failing provider, and optional
+    hedging fires the fallback when the primary is slower than its p95.
+    """
+
     def __init__(self):
         self.gemini = GeminiLLM()
         self.ollama = OllamaLLM()
         self.logger = logging.getLogger(__name__)
+        self.gates = {
+            "gemini": ProviderGate(
+                name="gemini",
+                llm=self.gemini,
+                model=self.gemini.model_name,
+                concurrency=settings.GEMINI_CONCURRENCY,
+                rpm=_worker_bucket(settings.GEMINI_RPM),
+                tpm=_worker_bucket(settings.GEMINI_TPM),
+            ),
+            "ollama": ProviderGate(
+                name="ollama",
+                llm=self.ollama,
+                model=f"ollama/{self.ollama.model}",
+                concurrency=settings.OLLAMA_CONCURRENCY,
+            ),
+        }
+
+    def model_for(self, priority: bool = False) -> str:
+        """Model a call is routed to first, if every provider is available."""
+        return self._chain(priority)[0].model
+
+    def _chain(self, priority: bool) -> List[ProviderGate]:
+        # High priority (Gap Analysis/Pathfinding) uses Gemini Free Tier
+        if priority:
+            return [self.gates["gemini"], self.gates["ollama"]]
+        # Default to local Ollama for everything else
+        return [self.gates["ollama"]]
 
     async def run(
         self, prompt: str, system_instruction: str = "", priority: bool = False
     ) -> str:
+        text, _ = await self.run_with_model(prompt, system_instruction, priority)
+        return text
+
+    async def run_with_model(
+        self, prompt: str, system_instruction: str = "", priority: bool = False
+    ) -> Tuple[str, str]:
+        """Like run(), plus the model that actually served the answer."""
         with tracer.start_as_current_span("llm_router_execution") as span:
-            # High priority (Gap Analysis/Pathfinding) uses Gemini Free Tier
-            if priority:
+            tokens = estimate_tokens(prompt, system_instruction)
+            chain = self._chain(priority)
+            last_error: Optional[Exception] = None
+
+            for index, gate in enumerate(chain):
+                last_resort = index == len(chain) - 1
+                reason = await gate.admit(tokens, last_resort=last_resort)
+                if reason:
+                    _record_route(gate.name, "skipped", reason)
+                    span.set_attribute(f"llm.{gate.name}.skipped", reason)
+                    continue
+
+                fallback = None if last_resort else chain[index + 1]
                 try:
-                    return await self.gemini.generate(prompt, system_instruction)
+                    if fallback is not None and settings.LLM_HEDGE_ENABLED:
+                        text, served_by = await self._hedged(
+                            gate, fallback, prompt, system_instruction, tokens
+                        )
+                    else:
+                        try:
+                            text = await self._call(gate, prompt, system_instruction)
+                        finally:
+                            gate.release()
+                        served_by = gate
+                    span.set_attribute("llm.provider", served_by.name)
+                    span.set_attribute("llm.fallback", served_by is not chain[0])
+                    return text, served_by.model
+                except LLMUnavailableError:
+                    # A hedge already tried the next provider
+                    raise
                 except Exception as e:
+                    last_error = e
                     self.logger.warning(
-                        f"Gemini Free Limit hit: {e}. Falling back to Ollama."
+                        f"{gate.name} call failed: {e}. Trying next provider."
                     )
-                    span.set_attribute("llm.fallback", True)
 
-            # Default to local Ollama for everything else
-            return await self.ollama.generate(prompt, system_instruction)
+            span.set_attribute("llm.fallback", True)
+            raise LLMUnavailableError(
+                f"No LLM provider available ({last_error or 'all rejected'})"
+            )
+
+    def stream(
+        self, prompt: str, system_instruction: str = "", priority: bool = False
+    ) -> "LLMStream":
+        """
+        Streams the response from the first admitted provider.
+        Falls back only until the first chunk is out; after that a failure
+        propagates, since a partial answer cannot be stitched together.
+        Consumers that stop reading once they have a full answer must call
+        complete() first; closing without it counts as an abandoned call.
+        """
+        return LLMStream(self, prompt, system_instruction, priority)
+
+    async def _stream(
+        self, handle: "LLMStream", prompt: str, system_instruction: str, priority: bool
+    ) -> AsyncIterator[str]:
+        tokens = estimate_tokens(prompt, system_instruction)
+        chain = self._chain(priority)
+        last_error: Optional[Exception] = None
+
+        for index, gate in enumerate(chain):
+            last_resort = index == len(chain) - 1
+            reason = await gate.admit(tokens, last_resort=last_resort)
+            if reason:
+                _record_route(gate.name, "skipped", reason)
+                continue
+
+            emitted = False
+            try:
+                async with aclosing(
+                    gate.llm.generate_stream(prompt, system_instruction)
+                ) as chunks:
+                    started = time.perf_counter()
+                    async for chunk in chunks:
+                        emitted = True
+                        handle.model = gate.model
+                        yield chunk
+                        if handle.completed:
+                            # Consumer has the whole answer: stop generating
+                            break
+                    elapsed = time.perf_counter() - started
+            except (GeneratorExit, asyncio.CancelledError):
+                # Abandoned before completion: not a provider failure
+                gate.breaker.release_probe()
+                raise
+            except Exception as e:
+                gate.breaker.record_failure()
+                _record_route(gate.name, "error", "exception")
+                if emitted:
+                    raise
+                last_error = e
+                self.logger.warning(
+                    f"{gate.name} stream failed: {e}. Trying next provider."
+                )
+                continue
+            finally:
+                gate.release()
+
+            gate.breaker.record_success()
+            gate.latency.add(elapsed)
+            llm_latency_histogram.record(elapsed * 1000, {"provider": gate.name})
+            _record_route(gate.name, "success", "streamed")
+            return
+
+        raise LLMUnavailableError(
+            f"No LLM provider available ({last_error or 'all rejected'})"
+        )
+
+    async def _call(
+        self, gate: ProviderGate, prompt: str, system_instruction: str
+    ) -> str:
+        """
+        One admitted call: breaker and metrics bookkeeping. The caller holds
+        the gate's slot (from admit) and releases it.
+        """
+        try:
+            started = time.perf_counter()
+            text = await gate.llm.generate(prompt, system_instruction)
+            elapsed = time.perf_counter() - started
+        except asyncio.CancelledError:
+            # Lost a hedge race: neither a success nor a provider failure
+            gate.breaker.release_probe()
+            raise
+        except Exception:
+            gate.breaker.record_failure()
+            _record_route(gate.name, "error", "exception")
+            raise
+
+        gate.breaker.record_success()
+        gate.latency.add(elapsed)
+        llm_latency_histogram.record(elapsed * 1000, {"provider": gate.name})
+        _record_route(gate.name, "success", "served")
+        return text
+
+    def _spawn(
+        self, gate: ProviderGate, prompt: str, system_instruction: str
+    ) -> asyncio.Task:
+        """Runs an admitted call as a task; its slot is freed however it ends."""
+        task = asyncio.create_task(self._call(gate, prompt, system_instruction))
+        # A done callback also fires for a task cancelled before it started
+        task.add_done_callback(lambda _: gate.release())
+        return task
+
+    async def _hedged(
+        self,
+        primary: ProviderGate,
+        fallback: ProviderGate,
+        prompt: str,
+        system_instruction: str,
+        tokens: int,
+    ):
+        """
+        Starts the primary; if it has not answered within its p95 latency,
+        starts the fallback too and returns whichever succeeds first.
+        If the primary fails before a hedge starts, its error propagates so
+        the caller's normal fallback path applies.
+        """
+        first = self._spawn(primary, prompt, system_instruction)
+        owners = {first: primary}
+        try:
+            done, _ = await asyncio.wait({first}, timeout=primary.hedge_delay())
+            if done or await fallback.admit(tokens) is not None:
+                return await first, primary
+
+            _record_route(fallback.name, "hedged", "slow_primary")
+            second = self._spawn(fallback, prompt, system_instruction)
+            owners[second] = fallback
+            pending = set(owners)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), owners[task]
+            raise LLMUnavailableError(
+                f"Primary and hedged calls both failed ({first.exception()})"
+            )
+        finally:
+            for task in owners:
+                if not task.done():
+                    task.cancel()
+
+
+class LLMStream:
+    """
+    Async iterator over a routed streamed response.
+    Call complete() once the answer is whole (e.g. the JSON object closed):
+    the next iteration then ends the stream and the provider is credited
+    with a success, even though generation stopped early.
+    """
+
+    def __init__(
+        self, router: LLMRouter, prompt: str, system_instruction: str, priority: bool
+    ):
+        self.completed = False
+        self.model: Optional[str] = None  # Serving model, once output starts
+        self._chunks = router._stream(self, prompt, system_instruction, priority)
+
+    def complete(self):
+        self.completed = True
+
+    def __aiter__(self) -> "LLMStream":
+        return self
+
+    async def __anext__(self) -> str:
+        return await self._chunks.__anext__()
+
+    async def aclose(self):
+        await self._chunks.aclose()
+
+
+def _record_route(provider: str, outcome: str, reason: str):
+    llm_route_counter.add(
+        1, {"provider": provider, "outcome": outcome, "reason": reason}
+    )
+
+
+# Shared router: one set of quotas and breakers per worker process
+llm_router = LLMRouter()
@@ -1,17 +1,50 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 # Absolute imports based on your repository structure
 from app.api.routes import router as career_router
-from app.core.observability import tracer  # Ensures OTEL initialization
+from app.core.observability import setup_telemetry, shutdown_telemetry
+from app.services.redis_cache import cache
+from app.services.http_clients import http_clients
+from app.services.weaviate_service import weaviate_service
+from app.services.job_indexer import job_indexer
+from app.services.analysis_queue import analysis_queue
+from app.services import pdf_extractor
+from app.llm.gemini import configure_gemini
 
 # Initialize Production Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("nexus-talent")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App-scoped resources: opened once per worker, closed on shutdown."""
+    setup_telemetry()  # No-op if gunicorn's post_fork already ran it
+    configure_gemini()
+    await http_clients.start()
+    await analysis_queue.start()
+    try:
+        await weaviate_service.connect()
+    except Exception as e:
+        # Retrieval degrades to the external API until Weaviate is reachable
+        logger.warning(f"Weaviate unavailable at startup: {e}")
+    logger.info("Nexus-Talent AI Engine successfully launched.")
+    # Any additional startup logic (DB warmups) goes here
+    yield
+    # Release pooled connections so workers exit cleanly
+    await analysis_queue.close()
+    await job_indexer.close()
+    await http_clients.close()
+    await weaviate_service.close()
+    pdf_extractor.shutdown()
+    await cache.close()
+    shutdown_telemetry()
+
+
 def create_app() -> FastAPI:
     """
     Factory to initialize the FastAPI application with
@@ -23,6 +56,7 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/api/docs",  # Standard professional path
         redoc_url="/api/redoc",
+        lifespan=lifespan,
     )
 
     # 1. Security & CORS Configuration
@@ -48,11 +82,6 @@ def create_app() -> FastAPI:
     # Captures HTTP metrics (latencies, errors) automatically
     FastAPIInstrumentor.instrument_app(app)
 
-    @app.on_event("startup")
-    async def startup_event():
-        logger.info("Nexus-Talent AI Engine successfully launched.")
-        # Any additional startup logic (DB warmups) goes here
-
     return app
 
 
@@ -1,10 +1,138 @@
-from sentence_transformers import CrossEncoder
+import asyncio
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence, Tuple
+import logging
+from app.core.config import settings
+from app.models.inference_backends import TorchBackend, build_backend, verify_parity
+
+logger = logging.getLogger("nexus-talent")
 
 
 class ATSCrossEncoder:
     def __init__(self):
-        self.model = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+        self.backend = self._load_backend(settings.ATS_BACKEND)
+        # Cache namespace: a different model or runtime never reuses old scores
+        self.model_id = f"{settings.ATS_MODEL_NAME}@{self.backend.name}"
+
+        # Dedicated inference executor keeps the model off the event loop.
+        # Threads are spawned lazily on first submit, i.e. after the fork.
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.ATS_INFERENCE_THREADS,
+            thread_name_prefix="ats-inference",
+        )
+        self._queue: asyncio.Queue = None
+        self._batch_worker: asyncio.Task = None
+
+    def _load_backend(self, name: str):
+        """Builds the configured runtime, falling back to PyTorch on parity drift."""
+        model_name = settings.ATS_MODEL_NAME
+        if name == "torch":
+            return TorchBackend(model_name)
 
+        try:
+            backend = build_backend(name, model_name)
+            if settings.ATS_PARITY_CHECK:
+                drift = verify_parity(
+                    backend, model_name, settings.ATS_PARITY_TOLERANCE
+                )
+                logger.info(f"ATS backend {name} parity OK (max drift {drift:.4f})")
+            return backend
+        except Exception as e:
+            logger.error(f"ATS backend {name} unavailable, using torch: {e}")
+            return TorchBackend(model_name)
 
     def score(self, resume, jd):
-        return int(self.model.predict([(resume, jd)])[0] * 100)
\ No newline at end of file
+        return self.predict_pairs([(resume, jd)])[0]
+
+    def score_batch(
+        self, resume: str, jds: Sequence[str], batch_size: int = None
+    ) -> List[int]:
+        """
+        Scores one resume against many JDs in a single predict() call.
+        The tokenizer/forward pass is chunked internally by batch_size.
+        """
+        return self.predict_pairs([(resume, jd) for jd in jds], batch_size)
+
+    def predict_pairs(
+        self, pairs: Sequence[Tuple[str, str]], batch_size: int = None
+    ) -> List[int]:
+        """Raw (resume, jd) pair scoring on a 0-100 scale."""
+        if not pairs:
+            return []
+        raw_scores = self.backend.predict(
+            list(pairs), batch_size or settings.ATS_BATCH_SIZE
+        )
+        return [int(s * 100) for s in raw_scores]
+
+    # --- Async API (micro-batched across concurrent requests) ---
+
+    async def score_async(self, resume: str, jd: str) -> int:
+        return (await self._submit([(resume, jd)]))[0]
+
+    async def score_batch_async(self, resume: str, jds: Sequence[str]) -> List[int]:
+        return await self._submit([(resume, jd) for jd in jds])
+
+    async def _submit(self, pairs: List[Tuple[str, str]]) -> List[int]:
+        """Enqueues pairs for the batch worker and awaits their scores."""
+        if not pairs:
+            return []
+        loop = asyncio.get_running_loop()
+
+        # Lazily (re)start the worker on the loop serving this request
+        if (
+            self._batch_worker is None
+            or self._batch_worker.done()
+            or self._batch_worker.get_loop() is not loop
+        ):
+            self._queue = asyncio.Queue()
+            self._batch_worker = loop.create_task(self._batch_loop())
+
+        futures = []
+        for pair in pairs:
+            future = loop.create_future()
+            self._queue.put_nowait((pair, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _batch_loop(self):
+        """
+        Collects pairs from concurrent callers into micro-batches.
+        A batch is flushed when it reaches ATS_MAX_BATCH pairs or when
+        ATS_MAX_WAIT_MS has elapsed since its first pair arrived.
+        """
+        loop = asyncio.get_running_loop()
+        max_batch = settings.ATS_MAX_BATCH
+        max_wait = settings.ATS_MAX_WAIT_MS / 1000
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + max_wait
+            while len(batch) < max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                scores = await loop.run_in_executor(
+                    self._executor, self.predict_pairs, [pair for pair, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(score)
+
+
+@lru_cache(maxsize=1)
+def get_ats_encoder() -> ATSCrossEncoder:
+    """Process-wide encoder; loaded once in the gunicorn master when preloading."""
+    return ATSCrossEncoder()
@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import Any, Dict, Sequence
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from app.core.config import settings
+
+
+class JobEmbedder:
+    """
+    Bi-encoder for job retrieval. Weaviate runs with no vectorizer module,
+    so the same model embeds postings at index time and queries at search time.
+    """
+
+    def __init__(self):
+        self.model = SentenceTransformer(settings.JOB_EMBEDDING_MODEL)
+        self.model_id = settings.JOB_EMBEDDING_MODEL
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalized float32 embeddings, one row per text."""
+        return self.model.encode(
+            list(texts),
+            batch_size=settings.JOB_EMBED_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype(np.float32)
+
+    @staticmethod
+    def job_text(job: Dict[str, Any]) -> str:
+        header = f"{job.get('title') or ''} | {job.get('company') or ''}"
+        return f"{header}\n{job.get('jd') or ''}"
+
+    @staticmethod
+    def query_text(title: str, skills: Sequence[str]) -> str:
+        return f"{title or ''} {' '.join(skills or [])}".strip()
+
+
+@lru_cache(maxsize=1)
+def get_job_embedder() -> JobEmbedder:
+    """Process-wide embedder; loaded once in the gunicorn master when preloading."""
+    return JobEmbedder()
@@ -0,0 +1,242 @@
+import argparse
+import gc
+import json
+import logging
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.core.config import settings
+
+logger = logging.getLogger("nexus-talent")
+
+# Canned pairs used to verify a runtime against the PyTorch reference
+PARITY_PAIRS: List[Tuple[str, str]] = [
+    (
+        "Senior Python developer, 6 years FastAPI, Redis, Kubernetes, AWS.",
+        "Backend engineer to build async Python APIs on Kubernetes.",
+    ),
+    (
+        "Registered nurse with ICU and emergency care experience.",
+        "Frontend engineer with React, TypeScript and design systems.",
+    ),
+    (
+        "Data scientist: PyTorch, NLP, transformers, model deployment.",
+        "ML engineer to fine-tune and serve transformer models in production.",
+    ),
+    ("", "Any role"),
+]
+
+
+class TorchBackend:
+    """Reference backend: sentence-transformers CrossEncoder on PyTorch."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import CrossEncoder
+
+        self.model = CrossEncoder(model_name)
+        # Inference-only weights: no grad buffers to dirty shared CoW pages
+        self.model.model.eval()
+        self.model.model.requires_grad_(False)
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], batch_size: int) -> np.ndarray:
+        return np.asarray(self.model.predict(list(pairs), batch_size=batch_size))
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime backend (fp32 or int8 dynamically quantized).
+    Loads a pre-exported model from ATS_ONNX_DIR; exports on first use if missing.
+    """
+
+    def __init__(self, model_name: str, quantized: bool = False):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.name = "onnx-int8" if quantized else "onnx"
+        model_path = export_onnx(model_name, settings.ATS_ONNX_DIR, quantized)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = settings.ATS_ONNX_THREADS
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(settings.ATS_ONNX_DIR)
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], batch_size: int) -> np.ndarray:
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            chunk = pairs[start : start + batch_size]
+            features = self.tokenizer(
+                [a for a, _ in chunk],
+                [b for _, b in chunk],
+                padding=True,
+                truncation="longest_first",
+                max_length=self.tokenizer.model_max_length,
+                return_tensors="np",
+            )
+            feed = {
+                k: v.astype(np.int64)
+                for k, v in features.items()
+                if k in self.input_names
+            }
+            logits = self.session.run(None, feed)[0][:, 0]
+            # Match CrossEncoder's default sigmoid activation for 1-label heads
+            scores.append(1.0 / (1.0 + np.exp(-logits)))
+        return np.concatenate(scores) if scores else np.empty(0)
+
+
+def export_onnx(model_name: str, out_dir: str, quantized: bool = False) -> str:
+    """
+    Exports the cross-encoder (and its tokenizer) to ONNX, optionally
+    producing an int8 dynamically quantized copy. Idempotent.
+    """
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    int8_path = os.path.join(out_dir, "model_int8.onnx")
+    target = int8_path if quantized else fp32_path
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(out_dir, exist_ok=True)
+    # A new artifact invalidates any parity result recorded for its name
+    _remove_quietly(_parity_path(out_dir, "onnx-int8" if quantized else "onnx"))
+    if not os.path.exists(fp32_path):
+        _remove_quietly(_parity_path(out_dir, "onnx"))
+        import torch
+        from sentence_transformers import CrossEncoder
+
+        logger.info(f"Exporting {model_name} to ONNX at {fp32_path}")
+        reference = CrossEncoder(model_name)
+        reference.model.eval()
+        reference.tokenizer.save_pretrained(out_dir)
+
+        dummy = reference.tokenizer(
+            ["resume"], ["job description"], return_tensors="pt"
+        )
+        input_names = list(dummy.keys())
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+        with torch.no_grad():
+            torch.onnx.export(
+                reference.model,
+                (dict(dummy),),
+                fp32_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+            )
+
+    if quantized:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing {fp32_path} to int8 at {int8_path}")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    return target
+
+
+def build_backend(name: str, model_name: str):
+    """Factory for the ATS_BACKEND setting: torch | onnx | onnx-int8."""
+    if name == "torch":
+        return TorchBackend(model_name)
+    if name == "onnx":
+        return OnnxBackend(model_name, quantized=False)
+    if name == "onnx-int8":
+        return OnnxBackend(model_name, quantized=True)
+    raise ValueError(f"Unknown ATS backend: {name}")
+
+
+def _parity_path(out_dir: str, backend_name: str) -> str:
+    return os.path.join(out_dir, f"parity-{backend_name}.json")
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _recorded_drift(backend_name: str, model_name: str) -> Optional[float]:
+    """Drift recorded when this exported artifact was last verified, if any."""
+    try:
+        with open(_parity_path(settings.ATS_ONNX_DIR, backend_name)) as fh:
+            record = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if record.get("model") != model_name:
+        return None
+    return record.get("drift")
+
+
+def verify_parity(candidate, model_name: str, tolerance: float) -> float:
+    """
+    check_parity against the PyTorch reference, run once per exported
+    artifact: the result is recorded next to it (at export time, or by the
+    first process to load it) and later processes reuse it instead of
+    loading a second model. The reference is released right after.
+    """
+    drift = _recorded_drift(candidate.name, model_name)
+    if drift is not None:
+        if drift > tolerance:
+            raise ValueError(
+                f"{candidate.name} recorded drift {drift:.4f} from torch "
+                f"(tolerance {tolerance})"
+            )
+        return drift
+
+    reference = TorchBackend(model_name)
+    try:
+        drift = check_parity(candidate, reference, tolerance)
+    finally:
+        del reference
+        # Free the weights now, before a preloading master gc.freeze()s them
+        gc.collect()
+
+    try:
+        with open(_parity_path(settings.ATS_ONNX_DIR, candidate.name), "w") as fh:
+            json.dump({"model": model_name, "drift": drift}, fh)
+    except OSError as e:
+        logger.warning(f"Could not record {candidate.name} parity: {e}")
+    return drift
+
+
+def check_parity(candidate, reference, tolerance: float) -> float:
+    """
+    Scores PARITY_PAIRS on both backends and returns the max absolute
+    difference (0-1 scale). Raises ValueError if it exceeds the tolerance.
+    """
+    batch_size = len(PARITY_PAIRS)
+    expected = reference.predict(PARITY_PAIRS, batch_size)
+    actual = candidate.predict(PARITY_PAIRS, batch_size)
+    drift = float(np.max(np.abs(expected - actual)))
+    if drift > tolerance:
+        raise ValueError(
+            f"{candidate.name} drifted {drift:.4f} from {reference.name} "
+            f"(tolerance {tolerance})"
+        )
+    return drift
+
+
+if __name__ == "__main__":
+    # Offline build step: python -m app.models.inference_backends --quantize
+    parser = argparse.ArgumentParser(description="Export the ATS cross-encoder")
+    parser.add_argument("--quantize", action="store_true", help="Also build int8")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    backend_name = "onnx-int8" if args.quantize else "onnx"
+    export_onnx(settings.ATS_MODEL_NAME, settings.ATS_ONNX_DIR, args.quantize)
+    # Always re-verify here; the recorded result spares the API workers
+    _remove_quietly(_parity_path(settings.ATS_ONNX_DIR, backend_name))
+    drift = verify_parity(
+        build_backend(backend_name, settings.ATS_MODEL_NAME),
+        settings.ATS_MODEL_NAME,
+        settings.ATS_PARITY_TOLERANCE,
+    )
+    logger.info(f"{backend_name} parity OK (max drift {drift:.4f})")
@@ -1,4 +1,17 @@
-from typing import TypedDict, List, Optional, Dict, Any
+import asyncio
+import copy
+import hashlib
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+)
 from langgraph.graph import StateGraph, START, END
 from app.agents.sourcing_agent import sourcing_agent
 from app.agents.ats_agent import ats_agent
@@ -6,67 +19,128 @@ from app.agents.gap_agent import gap_agent
 from app.agents.pathfinder_agent import pathfinder_agent
 from app.services.resume_parser import parse_resume_pdf  # Integrated Parser
 from app.api.schemas import ResumeData
+from app.core.config import settings
 from app.core.observability import tracer
+from app.services.redis_cache import content_hash
+
+
+def _first_error(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    """Reducer: parallel branches may both fail; keep the earliest error."""
+    return left or right
 
 
 # 1. Define the Industry-Grade State Schema
 class AgentState(TypedDict):
     # Inputs
     resume_bytes: bytes  # Raw input from FastAPI
+    resume: str
     job_title: str
     location: str
 
     # Structured Internal Data
     resume_object: Optional[ResumeData]  # Structured & Sanitized
+    resume_hash: str  # Content-addressed cache identity, computed once
     jobs: List[Dict[str, Any]]
+    job: Dict[str, Any]  # Best match, promoted by the ATS agent
 
     # Results
     score: float
     missing_skills: Dict[str, Any]
+    recommendation_status: str
+    priority_skill: str
     learning_path: List[Dict[str, Any]]
-    error: Optional[str]
+    error: Annotated[Optional[str], _first_error]
 
 
 # 2. Dedicated Parsing Node
 async def parser_node(state: AgentState):
     """Initial Security & Parsing Layer."""
     try:
-        resume_obj = await parse_resume_pdf(state["resume_bytes"])
+        resume_obj = await asyncio.wait_for(
+            parse_resume_pdf(state["resume_bytes"]), settings.PARSE_NODE_TIMEOUT_S
+        )
         return {"resume_object": resume_obj}
     except Exception as e:
         return {"error": f"Parsing failed: {str(e)}"}
 
 
-# 3. Logic for Conditional Routing
-def should_analyze_gaps(state: AgentState):
-    """Router: Decisions based on ATS performance."""
-    if state.get("score", 0) < 85:
-        return "gap"
-    return "path"
+# 3. Per-Node Budgets & Outputs
+# Each branch node writes only the keys it owns, so parallel branches never
+# collide; a node that blows its budget returns its fallback instead.
+NODE_OUTPUTS = {
+    "source": ["jobs"],
+    "score": ["jobs", "job", "score", "resume_hash"],
+    "gap": ["missing_skills", "recommendation_status", "priority_skill"],
+    "path": ["learning_path"],
+}
+NODE_FALLBACKS = {
+    "source": {"jobs": []},
+    "score": {"score": 0.0},
+    "gap": {"missing_skills": {}},
+    "path": {"learning_path": []},
+}
+
+
+def budgeted_node(name: str, agent: Callable, timeout_s: float):
+    """Wraps an agent with a timeout budget and explicit state outputs."""
+
+    async def node(state: AgentState):
+        with tracer.start_as_current_span(f"node.{name}") as span:
+            span.set_attribute("node.timeout_s", timeout_s)
+            try:
+                # Agents mutate their input, nested jobs included (the ATS
+                # agent scores them in place); a deep copy keeps parallel
+                # branches and timed-out agents from touching shared state.
+                # Bytes/str values are immutable and are not copied.
+                result = await asyncio.wait_for(agent(copy.deepcopy(state)), timeout_s)
+            except asyncio.TimeoutError:
+                span.set_status("error", "Node budget exceeded")
+                return {**NODE_FALLBACKS[name], "error": f"{name} timed out"}
+
+            update = {k: result[k] for k in NODE_OUTPUTS[name] if k in result}
+            if result.get("error") and result["error"] != state.get("error"):
+                update["error"] = result["error"]
+            return update
+
+    return node
 
 
 # 4. Build the Compiled Graph
 def create_career_intelligence_graph():
+    """
+    parse -> (source -> score) || (gap -> path) -> END
+    Sourcing/scoring and the target-role gap analysis/learning path are
+    independent, so they run as parallel branches joined at END.
+    """
     workflow = StateGraph(AgentState)
 
     # Add Nodes
     workflow.add_node("parse", parser_node)  # Entry Security/Sanitization Node
-    workflow.add_node("source", sourcing_agent)
-    workflow.add_node("score", ats_agent)
-    workflow.add_node("gap", gap_agent)
-    workflow.add_node("path", pathfinder_agent)
+    workflow.add_node(
+        "source",
+        budgeted_node("source", sourcing_agent, settings.SOURCE_NODE_TIMEOUT_S),
+    )
+    workflow.add_node(
+        "score", budgeted_node("score", ats_agent, settings.SCORE_NODE_TIMEOUT_S)
+    )
+    workflow.add_node(
+        "gap", budgeted_node("gap", gap_agent, settings.GAP_NODE_TIMEOUT_S)
+    )
+    workflow.add_node(
+        "path", budgeted_node("path", pathfinder_agent, settings.PATH_NODE_TIMEOUT_S)
+    )
 
     # Define Workflow Logic
     workflow.add_edge(START, "parse")  # Ensure parse happens first
+
+    # Fan-out: both branches start as soon as parsing completes
     workflow.add_edge("parse", "source")
+    workflow.add_edge("parse", "gap")
     workflow.add_edge("source", "score")
-
-    # Conditional Routing
-    workflow.add_conditional_edges(
-        "score", should_analyze_gaps, {"gap": "gap", "path": "path"}
-    )
-
     workflow.add_edge("gap", "path")
+
+    # Join: the run completes when both branches reach END
+    workflow.add_edge("score", END)
     workflow.add_edge("path", END)
 
     return workflow.compile()
@@ -75,6 +149,28 @@ def create_career_intelligence_graph():
 career_engine = create_career_intelligence_graph()
 
 
+def build_initial_state(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Seeds the graph state from the API payload."""
+    # One content-addressed identity per request, reused by every agent
+    resume_text = input_data.get("resume")
+    resume_hash = (
+        content_hash(resume_text)
+        if resume_text
+        else hashlib.sha256(input_data.get("resume_bytes") or b"").hexdigest()
+    )
+
+    return {
+        "resume_bytes": input_data.get("resume_bytes"),
+        "resume": input_data.get("resume", ""),
+        "job_title": input_data.get("job_title"),
+        "location": input_data.get("location"),
+        "jobs": [],
+        "score": 0.0,
+        "resume_object": None,  # To be filled by 'parse' node
+        "resume_hash": resume_hash,
+    }
+
+
 async def run_graph(input_data: Dict[str, Any]):
     """
     Entry point to execute the Agentic Workflow.
@@ -83,16 +179,7 @@ async def run_graph(input_data: Dict[str, Any]):
         span.set_attribute("flow.type", "multi_agent_matchmaking")
 
         try:
-            initial_state = {
-                "resume_bytes": input_data.get("resume_bytes"),
-                "job_title": input_data.get("job_title"),
-                "location": input_data.get("location"),
-                "jobs": [],
-                "score": 0.0,
-                "resume_object": None,  # To be filled by 'parse' node
-            }
-
-            result = await career_engine.ainvoke(initial_state)
+            result = await career_engine.ainvoke(build_initial_state(input_data))
 
             if result.get("error"):
                 span.set_status("error", result["error"])
@@ -103,3 +190,23 @@ async def run_graph(input_data: Dict[str, Any]):
             span.record_exception(e)
             span.set_status("error", str(e))
             return {"error": str(e)}
+
+
+async def stream_graph(
+    input_data: Dict[str, Any]
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of run_graph: yields (node_name, state_update) as each
+    node completes. Closing the iterator early cancels the in-flight nodes.
+    """
+    with tracer.start_as_current_span("CareerGraph_StreamWorkflow") as span:
+        span.set_attribute("flow.type", "multi_agent_matchmaking")
+        span.set_attribute("flow.streaming", True)
+
+        async for chunk in career_engine.astream(
+            build_initial_state(input_data), stream_mode="updates"
+        ):
+            for node_name, update in chunk.items():
+                if update and update.get("error"):
+                    span.set_attribute(f"node.{node_name}.error", update["error"])
+                yield node_name, update or {}
@@ -0,0 +1,59 @@
+import html
+import itertools
+import random
+import re
+import string
+import timeit
+
+from app.core.security import security
+
+
+def legacy_sanitize(text: str) -> str:
+    """The original three-copy implementation, kept as the parity reference."""
+    if not text:
+        return ""
+    clean_text = html.escape(text)
+    clean_text = "".join(char for char in clean_text if char.isprintable())
+    return re.sub(r"\s+", " ", clean_text).strip()
+
+
+def make_document(size: int, noisy: bool = False, seed: int = 7) -> str:
+    """
+    Resume-like text. Typical documents are ASCII with newlines/tabs; noisy
+    ones add markup, controls, accents, NBSP, line separators and astral chars.
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "     .,;:-()/"
+    extras = ["\n", "\n\n", "\t"]
+    if noisy:
+        extras += ["é", "<b>", "&", '"', "'", "\x00", "\u00a0", "\u2028", "\U000e0001", "  "]
+    parts, length = [], 0
+    while length < size:
+        part = (
+            rng.choice(extras)
+            if rng.random() < 0.05
+            else "".join(rng.choices(alphabet, k=rng.randint(3, 12)))
+        )
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def main():
+    print(f"{'profile':>8} {'chars':>10} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}")
+    for noisy, size in itertools.product((False, True), (10_000, 100_000, 1_000_000)):
+        doc = make_document(size, noisy)
+        assert security.sanitize_input(doc) == legacy_sanitize(doc), "parity"
+        pages = [doc[i : i + 3000] for i in range(0, len(doc), 3000)]
+        assert security.sanitize_input(iter(pages)) == legacy_sanitize(doc), "chunks"
+
+        runs = max(1, 2_000_000 // size)
+        legacy = timeit.timeit(lambda: legacy_sanitize(doc), number=runs) / runs
+        new = timeit.timeit(lambda: security.sanitize_input(doc), number=runs) / runs
+        profile = "noisy" if noisy else "typical"
+        print(f"{profile:>8} {size:>10} {legacy * 1e3:>10.2f} {new * 1e3:>10.2f} {legacy / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    # python -m app.scripts.bench_sanitizer
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Iterator, List, Set, Tuple
+
+from app.services import pdf_extractor
+from app.services.bulk_resume_import import import_resumes
+
+logger = logging.getLogger("nexus-talent")
+
+
+def find_pdfs(paths: List[str]) -> List[str]:
+    """PDF files given directly or found (recursively) under directories."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(
+                    os.path.join(root, f) for f in files if f.lower().endswith(".pdf")
+                )
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def read_documents(files: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """Lazily reads files, so only one chunk of PDFs is in memory at a time."""
+    for path in files:
+        with open(path, "rb") as fh:
+            yield path, fh.read()
+
+
+def load_checkpoint(out_path: str) -> Set[str]:
+    """
+    The output file is the checkpoint: documents already written with
+    status "ok" are skipped on restart, failed ones are retried.
+    """
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    line = "\n"
+    with open(out_path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from a crash mid-write
+            if record.get("status") == "ok":
+                done.add(record["sha256"])
+    if not line.endswith("\n"):
+        # Terminate the torn line so appended records stay parseable
+        with open(out_path, "a", encoding="utf-8") as fh:
+            fh.write("\n")
+    return done
+
+
+async def main(paths: List[str], out_path: str):
+    files = find_pdfs(paths)
+    done = load_checkpoint(out_path)
+    logger.info(f"Bulk import: {len(files)} files, {len(done)} already imported")
+
+    ok = failed = 0
+    try:
+        with open(out_path, "a", encoding="utf-8") as out:
+            async for record in import_resumes(read_documents(files), skip=done):
+                out.write(json.dumps(record) + "\n")
+                # Durable per record: a crash loses at most the in-flight batch
+                out.flush()
+                os.fsync(out.fileno())
+                if record["status"] == "ok":
+                    ok += 1
+                else:
+                    failed += 1
+                    logger.warning(f"{record['source']}: {record['error']}")
+    finally:
+        pdf_extractor.shutdown()
+    logger.info(f"Bulk import finished: {ok} parsed, {failed} failed -> {out_path}")
+
+
+if __name__ == "__main__":
+    # python -m app.scripts.bulk_import_resumes resumes/ --out resumes.jsonl
+    parser = argparse.ArgumentParser(
+        description="Parse a folder of resume PDFs into structured JSONL"
+    )
+    parser.add_argument("paths", nargs="+", help="PDF files or directories")
+    parser.add_argument("--out", default="resumes.jsonl", help="JSONL output")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.paths, args.out))
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import json
+import logging
+from typing import Iterator, List, Dict, Any
+
+from app.services.job_indexer import JobIndexer, ensure_schema
+from app.services.weaviate_service import weaviate_service
+
+logger = logging.getLogger("nexus-talent")
+
+
+def read_jsonl(path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Streams postings from a JSONL file in chunks (constant memory)."""
+    chunk = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            # Accept raw provider dumps that use "description" instead of "jd"
+            job.setdefault("jd", job.get("description"))
+            job.setdefault("source", "backfill")
+            chunk.append(job)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+async def main(paths: List[str], batch_size: int, concurrency: int):
+    await ensure_schema()
+    indexer = JobIndexer(batch_size=batch_size, concurrency=concurrency)
+    try:
+        for path in paths:
+            total = 0
+            # Several batches per chunk so upserts run concurrently
+            for chunk in read_jsonl(path, indexer.batch_size * indexer.concurrency):
+                total += await indexer.index_jobs(chunk)
+            logger.info(f"Indexed {total} jobs from {path}")
+    finally:
+        await weaviate_service.close()
+
+
+if __name__ == "__main__":
+    # make init-db  |  python -m app.scripts.init_weaviate jobs.jsonl ...
+    parser = argparse.ArgumentParser(
+        description="Create the Weaviate Job schema and backfill postings"
+    )
+    parser.add_argument("jsonl", nargs="*", help="JSONL files of job postings")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.jsonl, args.batch_size, args.concurrency))
@@ -0,0 +1,184 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.core.observability import tracer, meter
+from app.services.redis_cache import cache, content_hash
+
+logger = logging.getLogger("nexus-talent")
+
+RECORD_PREFIX = "analysis_job_v1"
+LEASE_PREFIX = "analysis_lease_v1"
+
+
+class QueueFullError(Exception):
+    """Raised when the local queue is at capacity (callers should shed load)."""
+
+
+def analysis_job_id(payload: Dict[str, Any]) -> str:
+    """Idempotency key: identical resume + target role share one run."""
+    resume = payload.get("resume") or payload.get("resume_bytes") or ""
+    if isinstance(resume, bytes):
+        resume = resume.decode("utf-8", errors="ignore")
+    return content_hash(resume, payload.get("job_title"), payload.get("location"))[:32]
+
+
+class AnalysisQueue:
+    """
+    Local priority queue + bounded worker pool for career analyses.
+    Status/results live in Redis so any worker can answer a poll.
+    The queue itself is in-process, so the owning process holds a short
+    lease (SET NX on the job id) for each queued/running job: duplicate
+    submits share the lease holder's run. If the owner dies, the lease
+    expires and the next submit takes the job over instead of waiting out
+    the TTL.
+    """
+
+    def __init__(self, workers: int = None, max_size: int = None):
+        self.worker_count = workers or settings.ANALYSIS_WORKERS
+        self.max_size = max_size or settings.ANALYSIS_QUEUE_SIZE
+        self._queue: asyncio.PriorityQueue = None
+        self._workers: List[asyncio.Task] = []
+        self._seq = itertools.count()  # FIFO within the same priority
+        self._owned: set = set()  # Job ids queued/running in this process
+        self._heartbeat: Optional[asyncio.Task] = None
+
+        # Infrastructure Metric: admission backlog per worker process
+        meter.create_observable_gauge(
+            "analysis_queue_depth",
+            callbacks=[self._observe_depth],
+            description="Queued career analyses awaiting a worker",
+        )
+
+    def _observe_depth(self, options):
+        from opentelemetry.metrics import Observation
+
+        yield Observation(self._queue.qsize() if self._queue else 0)
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"{RECORD_PREFIX}:{job_id}"
+
+    @staticmethod
+    def _lease_key(job_id: str) -> str:
+        return f"{LEASE_PREFIX}:{job_id}"
+
+    async def start(self):
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_size)
+        self._workers = [
+            asyncio.create_task(self._work(i)) for i in range(self.worker_count)
+        ]
+        self._heartbeat = asyncio.create_task(self._renew_leases())
+
+    async def close(self):
+        tasks = self._workers + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers, self._heartbeat = [], None
+
+    async def _renew_lease(self, job_id: str, only_if_absent: bool = False) -> bool:
+        return await cache.set_record(
+            self._lease_key(job_id),
+            {"pid": os.getpid(), "renewed_at": time.time()},
+            ttl=settings.ANALYSIS_LEASE_S,
+            only_if_absent=only_if_absent,
+        )
+
+    async def _renew_leases(self):
+        """Heartbeat: keeps this process's claims alive while it is running."""
+        while True:
+            await asyncio.sleep(settings.ANALYSIS_HEARTBEAT_S)
+            await asyncio.gather(
+                *(self._renew_lease(job_id) for job_id in list(self._owned))
+            )
+
+    async def submit(self, payload: Dict[str, Any], priority: int = 5) -> Dict[str, Any]:
+        """
+        Enqueues an analysis (lower priority value runs first) and returns its
+        status record. A duplicate of a queued/running/finished job returns
+        the existing record instead of starting a second run.
+        """
+        if self._queue is None:
+            await self.start()
+
+        job_id = analysis_job_id(payload)
+        record = {"id": job_id, "status": "queued", "submitted_at": time.time()}
+
+        # The lease is the run's lock: whoever claims it owns the job. Live
+        # duplicates fail the claim and share the owner's run; failed runs
+        # (lease released) and orphans (lease expired) are taken over by
+        # exactly one submit
+        if not await self._renew_lease(job_id, only_if_absent=True):
+            return await self.get(job_id) or record
+        existing = await self.get(job_id)
+        if existing and existing["status"] == "done":
+            await cache.delete_record(self._lease_key(job_id))
+            return existing
+        await cache.set_record(self._key(job_id), record, ttl=settings.ANALYSIS_RESULT_TTL)
+
+        try:
+            self._queue.put_nowait((priority, next(self._seq), job_id, payload))
+            self._owned.add(job_id)
+        except asyncio.QueueFull:
+            await cache.set_record(
+                self._key(job_id),
+                {**record, "status": "failed", "error": "queue_full"},
+                ttl=60,
+            )
+            await cache.delete_record(self._lease_key(job_id))
+            raise QueueFullError("Analysis queue is full")
+        return record
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await cache.get_record(self._key(job_id))
+
+    async def _work(self, worker_id: int):
+        # Imported lazily: the graph pulls in every agent and model
+        from app.orchestration.career_graph import run_graph
+
+        while True:
+            _, _, job_id, payload = await self._queue.get()
+            record = await self.get(job_id) or {"id": job_id}
+            with tracer.start_as_current_span("AnalysisQueueJob") as span:
+                span.set_attribute("analysis.job_id", job_id)
+                span.set_attribute("analysis.worker", worker_id)
+                try:
+                    await cache.set_record(
+                        self._key(job_id),
+                        {**record, "status": "running", "started_at": time.time()},
+                        ttl=settings.ANALYSIS_RESULT_TTL,
+                    )
+                    result = await run_graph(payload)
+                    result.pop("resume_bytes", None)
+                    # run_graph reports a crashed workflow as a bare {"error": ...}
+                    crashed = set(result) == {"error"}
+                    record = {
+                        **record,
+                        "status": "failed" if crashed else "done",
+                        "result": jsonable_encoder(result),
+                        "finished_at": time.time(),
+                    }
+                except Exception as e:
+                    span.record_exception(e)
+                    logger.error(f"Queued analysis {job_id} failed: {str(e)}")
+                    record = {**record, "status": "failed", "error": str(e)}
+                finally:
+                    self._queue.task_done()
+
+                await cache.set_record(
+                    self._key(job_id), record, ttl=settings.ANALYSIS_RESULT_TTL
+                )
+                # Final status is written: release the lease so a failed
+                # run can be resubmitted right away
+                self._owned.discard(job_id)
+                await cache.delete_record(self._lease_key(job_id))
+
+
+# Shared queue (one worker pool per process, started in the app lifespan)
+analysis_queue = AnalysisQueue()
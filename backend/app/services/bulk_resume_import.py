@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+from app.api.schemas import ResumeData
+from app.core.config import settings
+from app.core.observability import tracer
+from app.core.security import security
+from app.services.pdf_extractor import extract_resume_texts
+from app.services.resume_parser import MAX_RESUME_CHARS, extract_structured
+
+logger = logging.getLogger("nexus-talent")
+
+
+class BatchedResume(BaseModel):
+    index: int = Field(description="The number N of the [RESUME N] block.")
+    resume: ResumeData
+
+
+class ResumeBatch(BaseModel):
+    """Structured output for several resumes extracted in one request."""
+
+    resumes: List[BatchedResume] = Field(
+        description="One entry per resume block, in any order."
+    )
+
+
+def document_id(file_bytes: bytes) -> str:
+    """Content identity of an upload: renamed copies are the same resume."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def _record(
+    source: str,
+    sha256: str,
+    resume: Optional[ResumeData] = None,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One JSONL output line; `status` drives checkpoint resumption."""
+    return {
+        "source": source,
+        "sha256": sha256,
+        "status": "ok" if resume is not None else "error",
+        "resume": resume.model_dump() if resume is not None else None,
+        "error": error,
+    }
+
+
+def _error_text(e: BaseException) -> str:
+    # HTTPException (e.g. oversized file) carries its message in `detail`
+    return str(getattr(e, "detail", None) or e) or type(e).__name__
+
+
+def _pack(texts: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+    """Greedy batches bounded by resume count and prompt characters."""
+    batches, current, size = [], [], 0
+    for position, text in texts:
+        text = text[:MAX_RESUME_CHARS]
+        if current and (
+            len(current) >= settings.BULK_BATCH_SIZE
+            or size + len(text) > settings.BULK_BATCH_MAX_CHARS
+        ):
+            batches.append(current)
+            current, size = [], 0
+        current.append((position, text))
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _extract_batch(batch: List[Tuple[int, str]]) -> Dict[int, Any]:
+    """
+    Extracts a packed batch: position -> ResumeData, or the exception.
+    Resumes the batched answer dropped (or the whole batch, if the call
+    failed) are retried one per request.
+    """
+    results: Dict[int, Any] = {}
+    if len(batch) > 1:
+        blocks = "\n\n".join(
+            f"[RESUME {i}]\n{text}" for i, (_, text) in enumerate(batch)
+        )
+        prompt = (
+            f"Extract details from each of the {len(batch)} resumes below. "
+            f"Return exactly one entry per resume, tagged with its number.\n\n{blocks}"
+        )
+        try:
+            response = await extract_structured(ResumeBatch, prompt)
+            for entry in response.resumes:
+                if 0 <= entry.index < len(batch):
+                    results.setdefault(batch[entry.index][0], entry.resume)
+        except Exception as e:
+            logger.warning(f"Batched extraction failed, retrying singly: {e}")
+
+    async def single(position: int, text: str):
+        try:
+            results[position] = await extract_structured(
+                ResumeData, f"Extract details from this resume: {text}"
+            )
+        except Exception as e:
+            results[position] = e
+
+    await asyncio.gather(
+        *(single(pos, text) for pos, text in batch if pos not in results)
+    )
+    return results
+
+
+async def import_resumes(
+    documents: Iterable[Tuple[str, bytes]], skip: Set[str] = frozenset()
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Bulk parser: yields one output record per document as batches finish.
+    Documents are read a chunk at a time; each chunk's text is extracted in
+    parallel in the PDF process pool, then packed into batched LLM requests.
+    Documents whose sha256 is in `skip` (already imported) are not re-parsed.
+    """
+    chunk: List[Tuple[str, bytes]] = []
+    for source, file_bytes in documents:
+        chunk.append((source, file_bytes))
+        if len(chunk) >= settings.BULK_CHUNK_SIZE:
+            async for record in _import_chunk(chunk, skip):
+                yield record
+            chunk = []
+    if chunk:
+        async for record in _import_chunk(chunk, skip):
+            yield record
+
+
+async def _import_chunk(
+    chunk: List[Tuple[str, bytes]], skip: Set[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    with tracer.start_as_current_span("bulk_resume_chunk") as span:
+        span.set_attribute("bulk.documents", len(chunk))
+        ids = [document_id(file_bytes) for _, file_bytes in chunk]
+        pending, skipped = [], 0
+        for position, ((source, file_bytes), sha256) in enumerate(zip(chunk, ids)):
+            if sha256 in skip:
+                skipped += 1
+                continue
+            try:
+                security.validate_file_size(len(file_bytes))
+                pending.append(position)
+            except Exception as e:
+                yield _record(source, sha256, error=_error_text(e))
+        span.set_attribute("bulk.skipped", skipped)
+
+        # 1. Parallel text extraction (process pool, per-document budget)
+        texts = await extract_resume_texts([chunk[i][1] for i in pending])
+        ready = []
+        for position, text in zip(pending, texts):
+            if isinstance(text, BaseException) or not text:
+                error = _error_text(text) if text else "No extractable text"
+                yield _record(chunk[position][0], ids[position], error=error)
+            else:
+                ready.append((position, text))
+
+        # 2. Batched structured extraction; records stream out per batch
+        batches = _pack(ready)
+        span.set_attribute("bulk.batches", len(batches))
+        limit = asyncio.Semaphore(settings.BULK_CONCURRENCY)
+
+        async def run(batch):
+            async with limit:
+                return await _extract_batch(batch)
+
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for position, result in (await finished).items():
+                    source, sha256 = chunk[position][0], ids[position]
+                    if isinstance(result, BaseException):
+                        yield _record(source, sha256, error=_error_text(result))
+                    else:
+                        yield _record(source, sha256, resume=result)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,157 @@
+import json
+import logging
+import zlib
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger("nexus-talent")
+
+# Optional accelerators: each codec degrades to the stdlib when missing
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+
+# --- Wire Format ---
+# byte 0     : magic (high nibble, 0xA) | wire version (low nibble)
+# byte 1     : serialization format (low nibble) | compression (high nibble)
+# byte 2..n  : payload
+# Legacy entries are plain JSON text. Valid JSON text starts with ASCII
+# (whitespace, a bracket, a quote, a digit, '-', or t/f/n), never with a
+# byte >= 0x80, so the magic byte cannot be mistaken for legacy JSON.
+MAGIC = 0xA0
+WIRE_VERSION = 0x01
+
+FORMAT_JSON = 0x01  # orjson and stdlib json share this format
+FORMAT_MSGPACK = 0x02
+
+COMPRESS_NONE = 0x00
+COMPRESS_ZLIB = 0x10
+COMPRESS_ZSTD = 0x20
+COMPRESS_LZ4 = 0x30
+
+_FORMATS = {"json": FORMAT_JSON, "orjson": FORMAT_JSON, "msgpack": FORMAT_MSGPACK}
+_COMPRESSIONS = {
+    "none": COMPRESS_NONE,
+    "zlib": COMPRESS_ZLIB,
+    "zstd": COMPRESS_ZSTD,
+    "lz4": COMPRESS_LZ4,
+}
+
+
+def _serialize(fmt: int, value: Any) -> bytes:
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _deserialize(fmt: int, payload: bytes) -> Any:
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.unpackb(payload, raw=False)
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _compress(method: int, payload: bytes) -> bytes:
+    if method == COMPRESS_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    if method == COMPRESS_LZ4:
+        return lz4_frame.compress(payload)
+    return zlib.compress(payload, 6)
+
+
+def _decompress(method: int, payload: bytes) -> bytes:
+    if method == COMPRESS_ZSTD:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if method == COMPRESS_LZ4:
+        return lz4_frame.decompress(payload)
+    return zlib.decompress(payload)
+
+
+def _unavailable(setting: str, value: str, package: str, fallback: str):
+    logger.warning(
+        f"{setting}={value} but {package} is not installed; using {fallback}"
+    )
+
+
+class CacheCodec:
+    """
+    Versioned binary codec for cached payloads.
+    Compresses only above `compress_min_bytes`; small scores stay raw.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "orjson",
+        compression: str = "zstd",
+        compress_min_bytes: int = 1024,
+    ):
+        self.format = _FORMATS[fmt]
+        if fmt == "orjson" and orjson is None:
+            _unavailable("CACHE_CODEC", fmt, "orjson", "stdlib json")
+        if self.format == FORMAT_MSGPACK and msgpack is None:
+            _unavailable("CACHE_CODEC", fmt, "msgpack", "JSON")
+            self.format = FORMAT_JSON
+
+        self.compression = _COMPRESSIONS[compression]
+        if (self.compression == COMPRESS_ZSTD and zstandard is None) or (
+            self.compression == COMPRESS_LZ4 and lz4_frame is None
+        ):
+            package = "zstandard" if self.compression == COMPRESS_ZSTD else "lz4"
+            _unavailable("CACHE_COMPRESSION", compression, package, "zlib")
+            self.compression = COMPRESS_ZLIB
+        self.compress_min_bytes = compress_min_bytes
+
+    def encode(self, value: Any) -> bytes:
+        payload = _serialize(self.format, value)
+        method = COMPRESS_NONE
+        compress = self.compression != COMPRESS_NONE
+        if compress and len(payload) >= self.compress_min_bytes:
+            payload = _compress(self.compression, payload)
+            method = self.compression
+        return bytes((MAGIC | WIRE_VERSION, self.format | method)) + payload
+
+    def decode(self, raw: bytes) -> Any:
+        """Decodes a payload; raises ValueError (or a codec error) if corrupt."""
+        if not raw:
+            return None
+        if raw[0] & 0xF0 != MAGIC:
+            return json.loads(raw)  # Legacy JSON text entry
+        if raw[0] & 0x0F != WIRE_VERSION or len(raw) < 2:
+            raise ValueError(f"Unknown cache wire version: {raw[0]:#x}")
+
+        fmt, method = raw[1] & 0x0F, raw[1] & 0xF0
+        if fmt not in (FORMAT_JSON, FORMAT_MSGPACK):
+            raise ValueError(f"Unknown cache format: {fmt:#x}")
+        payload = raw[2:]
+        if method != COMPRESS_NONE:
+            payload = _decompress(method, payload)
+        return _deserialize(fmt, payload)
+
+
+# Shared codec configured from Settings
+codec = CacheCodec(
+    fmt=settings.CACHE_CODEC,
+    compression=settings.CACHE_COMPRESSION,
+    compress_min_bytes=settings.CACHE_COMPRESS_MIN_BYTES,
+)
@@ -0,0 +1,159 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+import httpx
+from opentelemetry.metrics import CallbackOptions, Observation
+from app.core.observability import meter
+
+logger = logging.getLogger("nexus-talent")
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class UpstreamPolicy:
+    """Connection and timeout policy for one upstream service."""
+
+    timeout: float
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+
+# Per-upstream policies. Ollama generations are slow, job boards are not.
+UPSTREAMS: Dict[str, UpstreamPolicy] = {
+    "job_api": UpstreamPolicy(timeout=10.0, max_connections=20, max_keepalive=10),
+    "ollama": UpstreamPolicy(
+        timeout=120.0, max_connections=8, max_keepalive=8, http2=False
+    ),
+}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that reports back once it has been closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pooled transport and counts requests in flight (sent, response
+    body not yet closed), through httpx's public transport API only.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+        self.in_flight = 0
+
+    def _release(self):
+        self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, self._release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class HttpClientRegistry:
+    """
+    App-scoped pooled httpx clients, one per upstream.
+    Opened in the FastAPI lifespan and closed on shutdown; clients are
+    created lazily so scripts and background jobs work without the app.
+    """
+
+    def __init__(self, policies: Dict[str, UpstreamPolicy]):
+        self.policies = policies
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, CountingTransport] = {}
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._build(upstream)
+            self._clients[upstream] = client
+        return client
+
+    def _build(self, upstream: str) -> httpx.AsyncClient:
+        policy = self.policies[upstream]
+        # Our own transport, kept for the pool gauge
+        transport = CountingTransport(
+            httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=policy.max_connections,
+                    max_keepalive_connections=policy.max_keepalive,
+                    keepalive_expiry=policy.keepalive_expiry,
+                ),
+                http2=policy.http2 and HTTP2_AVAILABLE,
+            )
+        )
+        self._transports[upstream] = transport
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(policy.timeout, connect=policy.connect_timeout),
+        )
+
+    async def start(self):
+        for upstream in self.policies:
+            self.get(upstream)
+        logger.info(f"HTTP client pools ready: {', '.join(self.policies)}")
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+
+    def in_flight(self) -> Dict[str, int]:
+        """Requests in flight per upstream (compare with max_connections)."""
+        return {name: t.in_flight for name, t in self._transports.items()}
+
+
+# Shared registry (one set of pools per worker process)
+http_clients = HttpClientRegistry(UPSTREAMS)
+
+
+def _observe_pools(options: CallbackOptions) -> Iterable[Observation]:
+    for upstream, count in http_clients.in_flight().items():
+        yield Observation(count, {"upstream": upstream})
+
+
+# Infrastructure Metric: pool utilization per upstream
+meter.create_observable_gauge(
+    "http_pool_in_flight",
+    callbacks=[_observe_pools],
+    description="HTTP requests in flight per upstream pool",
+)
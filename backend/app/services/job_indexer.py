@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence
+
+from weaviate.classes.config import Configure, DataType, Property
+from weaviate.classes.data import DataObject
+from weaviate.util import generate_uuid5
+from app.core.config import settings
+from app.core.observability import tracer
+from app.models.embedder import get_job_embedder
+from app.services.redis_cache import content_hash
+from app.services.weaviate_service import JOB_COLLECTION, weaviate_service
+
+logger = logging.getLogger("nexus-talent")
+
+
+def job_content_hash(job: Dict[str, Any]) -> str:
+    """Dedup identity of a posting: same title/company/location/JD = same job."""
+    return content_hash(
+        job.get("title"), job.get("company"), job.get("location"), job.get("jd")
+    )
+
+
+async def ensure_schema():
+    """Creates the Job collection (bring-your-own-vector) if it is missing."""
+    await weaviate_service.connect()
+    client = weaviate_service.client
+    if await client.collections.exists(JOB_COLLECTION):
+        return
+
+    await client.collections.create(
+        JOB_COLLECTION,
+        vectorizer_config=Configure.Vectorizer.none(),
+        properties=[
+            Property(name="title", data_type=DataType.TEXT),
+            Property(name="company", data_type=DataType.TEXT),
+            Property(name="location", data_type=DataType.TEXT),
+            Property(name="description", data_type=DataType.TEXT),
+            Property(name="link", data_type=DataType.TEXT, skip_vectorization=True),
+            Property(name="source", data_type=DataType.TEXT, skip_vectorization=True),
+            Property(
+                name="content_hash", data_type=DataType.TEXT, skip_vectorization=True
+            ),
+        ],
+    )
+    logger.info(f"Created Weaviate collection {JOB_COLLECTION}")
+
+
+class JobIndexer:
+    """
+    Batch upserts postings into the Job collection.
+    Object UUIDs derive from the content hash, so re-indexing the same posting
+    overwrites instead of duplicating; a small in-process LRU of recent hashes
+    skips the embedding work for postings we have just written.
+    """
+
+    def __init__(self, batch_size: int = None, concurrency: int = None):
+        self.batch_size = batch_size or settings.JOB_INDEX_BATCH_SIZE
+        self.concurrency = concurrency or settings.JOB_INDEX_CONCURRENCY
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: asyncio.Queue = None
+        self._workers: List[asyncio.Task] = []
+
+    def _dedup(self, jobs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        fresh = {}
+        for job in jobs:
+            if not job.get("jd"):
+                continue
+            digest = job_content_hash(job)
+            if digest not in self._recent and digest not in fresh:
+                fresh[digest] = job
+        return [{**job, "content_hash": digest} for digest, job in fresh.items()]
+
+    def _remember(self, digests: Sequence[str]):
+        for digest in digests:
+            self._recent[digest] = None
+            self._recent.move_to_end(digest)
+        while len(self._recent) > settings.JOB_INDEX_DEDUP_CACHE:
+            self._recent.popitem(last=False)
+
+    async def index_jobs(self, jobs: Sequence[Dict[str, Any]]) -> int:
+        """Embeds and upserts postings in batches; returns the number written."""
+        fresh = self._dedup(jobs)
+        if not fresh:
+            return 0
+
+        await weaviate_service.connect()
+        collection = weaviate_service.client.collections.get(JOB_COLLECTION)
+        embedder = get_job_embedder()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def upsert(batch: List[Dict[str, Any]]) -> int:
+            async with semaphore:
+                with tracer.start_as_current_span("weaviate_batch_upsert") as span:
+                    span.set_attribute("weaviate.batch_size", len(batch))
+                    vectors = await asyncio.to_thread(
+                        embedder.embed, [embedder.job_text(j) for j in batch]
+                    )
+                    objects = [
+                        DataObject(
+                            uuid=generate_uuid5(job["content_hash"]),
+                            properties={
+                                "title": job.get("title"),
+                                "company": job.get("company"),
+                                "location": job.get("location"),
+                                "description": job.get("jd"),
+                                "link": job.get("link"),
+                                "source": job.get("source"),
+                                "content_hash": job["content_hash"],
+                            },
+                            vector=vector.tolist(),
+                        )
+                        for job, vector in zip(batch, vectors)
+                    ]
+                    result = await collection.data.insert_many(objects)
+                    if result.has_errors:
+                        span.set_status("error", "Partial batch failure")
+                        logger.error(f"Job upsert errors: {result.errors}")
+
+                    failed = set(result.errors)
+                    written = [
+                        job["content_hash"]
+                        for i, job in enumerate(batch)
+                        if i not in failed
+                    ]
+                    self._remember(written)
+                    return len(written)
+
+        batches = [
+            fresh[i : i + self.batch_size]
+            for i in range(0, len(fresh), self.batch_size)
+        ]
+        return sum(await asyncio.gather(*(upsert(b) for b in batches)))
+
+    # --- Background ingestion (fire-and-forget from the request path) ---
+
+    def enqueue(self, jobs: Sequence[Dict[str, Any]]):
+        """Schedules postings for indexing without blocking the caller."""
+        if not jobs:
+            return
+        if self._queue is None or not any(not w.done() for w in self._workers):
+            self._queue = asyncio.Queue(maxsize=settings.JOB_INDEX_QUEUE_SIZE)
+            self._workers = [asyncio.create_task(self._drain())]
+        try:
+            self._queue.put_nowait(list(jobs))
+        except asyncio.QueueFull:
+            logger.warning("Job index queue full; dropping batch")
+
+    async def _drain(self):
+        while True:
+            jobs = await self._queue.get()
+            # Coalesce whatever else is already waiting into one pass
+            while not self._queue.empty() and len(jobs) < self.batch_size:
+                jobs.extend(self._queue.get_nowait())
+            try:
+                await self.index_jobs(jobs)
+            except Exception as e:
+                logger.error(f"Background job indexing failed: {str(e)}")
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+# Shared indexer (one background worker per process)
+job_indexer = JobIndexer()
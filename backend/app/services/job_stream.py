@@ -1,60 +1,177 @@
-import httpx
+import asyncio
+import contextlib
 import logging
-from typing import List, Dict, Any
+import re
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Dict, Any, Optional
 from app.core.config import settings
 from app.core.observability import tracer
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger("nexus-talent")
 
 
+@dataclass
+class JobProvider:
+    """
+    Adapter for one external job board.
+    `fields` maps our standard keys to the provider's result keys.
+    """
+
+    name: str
+    url: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    results_key: str = "results"
+    fields: Dict[str, str] = field(
+        default_factory=lambda: {
+            "title": "job_title",
+            "company": "company_name",
+            "location": "location",
+            "jd": "description",
+            "link": "redirect_url",
+        }
+    )
+
+    def normalize(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Standardize the job format for the Sourcing Agent."""
+        posting = {key: job.get(src) for key, src in self.fields.items()}
+        posting["source"] = self.name
+        return posting
+
+    async def fetch(self, title: str, location: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields standardized postings from this provider. The response body is
+        parsed whole; the stream is incremental across providers, not within one.
+        """
+        params = {**self.params, "title": title, "location": location}
+
+        # Pooled keep-alive client shared across requests
+        client = http_clients.get("job_api")
+        # In a real scenario, you'd add headers={"Authorization": f"Bearer {settings.API_KEY}"}
+        response = await client.get(self.url, params=params)
+
+        if response.status_code != 200:
+            logger.error(f"External API error ({self.name}): {response.status_code}")
+            return
+
+        for job in response.json().get(self.results_key, []):
+            yield self.normalize(job)
+
+
+# Registered providers, queried concurrently.
+# Replace URL with actual endpoint from your provider (e.g., Adzuna, Reed)
+JOB_PROVIDERS: List[JobProvider] = [
+    JobProvider(
+        name="external_api",
+        url="https://api.jobprovider.com/v1/search",
+        params={"limit": 10, "country": "us"},
+    ),
+]
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _norm(value: Optional[str]) -> str:
+    return _NON_ALNUM.sub(" ", (value or "").casefold()).strip()
+
+
+def _dedup_keys(job: Dict[str, Any]) -> List[str]:
+    """
+    A posting is a duplicate if its title+company+location or its link was
+    already seen; the same job syndicated to two boards usually differs in one
+    of them. Location is part of the key: one employer hiring the same title
+    in several cities posts distinct jobs.
+    """
+    keys = []
+    if job.get("title") or job.get("company"):
+        title, company = _norm(job.get("title")), _norm(job.get("company"))
+        keys.append(f"tcl:{title}|{company}|{_norm(job.get('location'))}")
+    if job.get("link"):
+        keys.append(f"link:{job['link'].strip().rstrip('/').casefold()}")
+    return keys
+
+
+async def stream_jobs(
+    title: str,
+    location: str,
+    providers: List[JobProvider] = None,
+    deadline_ms: int = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streams de-duplicated postings from all providers as they arrive.
+    Stops at the deadline with whatever has been received; slow providers
+    are cancelled, so abandoning the iterator never leaves work behind.
+    """
+    providers = JOB_PROVIDERS if providers is None else providers
+    deadline_ms = deadline_ms or settings.JOB_STREAM_DEADLINE_MS
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_ms / 1000
+    # Bounded: providers wait for the consumer instead of buffering postings
+    # it will never read once it has enough
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.JOB_STREAM_MAX_JOBS)
+    done = object()
+
+    async def pump(provider: JobProvider):
+        try:
+            async for job in provider.fetch(title, location):
+                await queue.put(job)
+        except Exception as e:
+            logger.error(f"Job stream failure ({provider.name}): {str(e)}")
+        # Not in `finally`: a cancelled pump must not block on a full queue
+        await queue.put(done)
+
+    tasks = [asyncio.create_task(pump(p)) for p in providers]
+    seen = set()
+    remaining = len(tasks)
+    try:
+        while remaining:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if job is done:
+                remaining -= 1
+                continue
+
+            keys = _dedup_keys(job)
+            if any(k in seen for k in keys):
+                continue
+            seen.update(keys)
+            yield job
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def fetch_jobs(title: str, location: str) -> List[Dict[str, Any]]:
     """
     Fetches real-time job listings from external providers.
-    Uses asynchronous HTTP requests to maintain high performance.
+    Collects the merged stream until all providers finish, the deadline hits
+    or JOB_STREAM_MAX_JOBS arrive. List-compatible only: the sourcing node
+    caches and hands over a complete list, so scoring still starts after
+    this returns; what streaming buys here is that one slow provider no
+    longer holds up the others past the deadline or the cap.
     """
     with tracer.start_as_current_span("external_job_stream_fetch") as span:
         span.set_attribute("stream.query", title)
         span.set_attribute("stream.location", location)
+        span.set_attribute("stream.providers", len(JOB_PROVIDERS))
 
+        standardized_jobs = []
         try:
-            # Example using a mock aggregator or specific Job Board API
-            # Replace URL with actual endpoint from your provider (e.g., Adzuna, Reed)
-            api_url = f"https://api.jobprovider.com/v1/search"
-            params = {
-                "title": title,
-                "location": location,
-                "limit": 10,
-                "country": "us",
-            }
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # In a real scenario, you'd add headers={"Authorization": f"Bearer {settings.API_KEY}"}
-                response = await client.get(api_url, params=params)
-
-                if response.status_code != 200:
-                    logger.error(f"External API error: {response.status_code}")
-                    return []
-
-                raw_data = response.json()
-
-                # Standardize the job format for the Sourcing Agent
-                standardized_jobs = []
-                for job in raw_data.get("results", []):
-                    standardized_jobs.append(
-                        {
-                            "title": job.get("job_title"),
-                            "company": job.get("company_name"),
-                            "location": job.get("location"),
-                            "jd": job.get("description"),  # Crucial for ATS Agent
-                            "link": job.get("redirect_url"),
-                            "source": "external_api",
-                        }
-                    )
-
-                span.set_attribute("stream.jobs_returned", len(standardized_jobs))
-                return standardized_jobs
-
+            # aclosing: breaking early cancels the providers now, not at GC
+            async with contextlib.aclosing(stream_jobs(title, location)) as jobs:
+                async for job in jobs:
+                    standardized_jobs.append(job)
+                    if len(standardized_jobs) >= settings.JOB_STREAM_MAX_JOBS:
+                        break
         except Exception as e:
             span.record_exception(e)
             logger.error(f"Job stream failure: {str(e)}")
-            return []
+
+        span.set_attribute("stream.jobs_returned", len(standardized_jobs))
+        return standardized_jobs
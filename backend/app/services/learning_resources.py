@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.observability import tracer
+
+logger = logging.getLogger("nexus-talent")
+
+
+class ResourceProvider(ABC):
+    """Finds the single best learning resource for a skill."""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def search(self, skill: str) -> Optional[Dict[str, Any]]:
+        """Returns {"title", "resource_url"} or None when nothing matches."""
+        pass
+
+
+class YouTubeProvider(ResourceProvider):
+    """
+    Live YouTube Data API v3 search.
+    The client is built lazily from the bundled discovery document,
+    so importing this module never touches the network.
+    """
+
+    name = "youtube_v3"
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv("YOUTUBE_API_KEY")
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from googleapiclient.discovery import build  # pip install google-api-python-client
+
+            self._client = build(
+                "youtube",
+                "v3",
+                developerKey=self.api_key,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+        return self._client
+
+    async def search(self, skill: str) -> Optional[Dict[str, Any]]:
+        # Industry standard: specifically search for 'full course' to improve quality
+        query = f"{skill} masterclass full course 2026"
+
+        def execute():
+            return (
+                self._get_client()
+                .search()
+                .list(q=query, part="snippet", maxResults=1, type="video")
+                .execute()
+            )
+
+        # Run in thread pool since google-api-client is synchronous
+        response = await asyncio.to_thread(execute)
+        items = response.get("items") or []
+        if not items:
+            return None
+
+        video_id = items[0].get("id", {}).get("videoId")
+        return {
+            "title": items[0].get("snippet", {}).get("title", "Resource not found"),
+            "resource_url": (
+                f"https://www.youtube.com/watch?v={video_id}" if video_id else None
+            ),
+        }
+
+
+class LocalIndexProvider(ResourceProvider):
+    """
+    Offline course index: a prebuilt SQLite FTS5 database on disk,
+    opened read-only so every worker can share the same file.
+    Until the file exists every lookup misses; only an opened connection
+    is kept, so an index built after startup is picked up.
+    """
+
+    name = "local_index"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.LEARNING_INDEX_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and os.path.exists(self.path):
+            self._conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+        return self._conn
+
+    def _query(self, phrase: str) -> Optional[tuple]:
+        conn = self._get_conn()
+        if conn is None:
+            return None
+        return conn.execute(
+            "SELECT title, url FROM courses WHERE courses MATCH ? "
+            "ORDER BY rank LIMIT 1",
+            (phrase,),
+        ).fetchone()
+
+    async def search(self, skill: str) -> Optional[Dict[str, Any]]:
+        # Quote the skill as an FTS phrase so "C++" or "CI/CD" stay literal
+        phrase = '"' + skill.replace('"', '""') + '"'
+        # Off the event loop: sqlite3 blocks on disk I/O
+        row = await asyncio.to_thread(self._query, phrase)
+        if row is None:
+            return None
+        return {"title": row[0], "resource_url": row[1]}
+
+
+class FallbackChainProvider(ResourceProvider):
+    """Tries providers in order; errors (e.g. quota exhaustion) fall through."""
+
+    name = "fallback_chain"
+
+    def __init__(self, providers: List[ResourceProvider]):
+        self.providers = providers
+
+    async def search(self, skill: str) -> Optional[Dict[str, Any]]:
+        for provider in self.providers:
+            with tracer.start_as_current_span("learning_resource_lookup") as span:
+                span.set_attribute("search.query", skill)
+                span.set_attribute("search.system", provider.name)
+                try:
+                    resource = await provider.search(skill)
+                except Exception as e:
+                    span.record_exception(e)
+                    span.set_status("error", f"{provider.name} failure")
+                    logger.warning(f"{provider.name} lookup failed for {skill}: {e}")
+                    continue
+
+                span.set_attribute("search.found", resource is not None)
+                if resource:
+                    return {**resource, "source": provider.name}
+        return None
+
+
+def build_provider_chain(names: str = None) -> ResourceProvider:
+    """Builds the chain from LEARNING_PROVIDERS, e.g. "local,youtube"."""
+    providers: List[ResourceProvider] = []
+    for name in (names or settings.LEARNING_PROVIDERS).split(","):
+        name = name.strip()
+        if name == "local":
+            if not os.path.exists(settings.LEARNING_INDEX_PATH):
+                logger.warning(
+                    f"Learning index {settings.LEARNING_INDEX_PATH} missing; "
+                    "lookups miss until it is built"
+                )
+            providers.append(LocalIndexProvider())
+        elif name == "youtube":
+            providers.append(YouTubeProvider())
+        elif name:
+            raise ValueError(f"Unknown learning resource provider: {name}")
+    return FallbackChainProvider(providers)
+
+
+def build_index(source_path: str, index_path: str) -> int:
+    """
+    Builds the FTS5 index from a JSONL file of
+    {"skill": ..., "title": ..., "url": ...} records. Returns the row count.
+    """
+    tmp_path = f"{index_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute(
+        "CREATE VIRTUAL TABLE courses USING fts5("
+        "skill, title, url UNINDEXED, tokenize='unicode61')"
+    )
+    count = 0
+    with open(source_path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            conn.execute(
+                "INSERT INTO courses (skill, title, url) VALUES (?, ?, ?)",
+                (record["skill"], record["title"], record["url"]),
+            )
+            count += 1
+    conn.execute("INSERT INTO courses(courses) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+
+    # Atomic swap so running workers never see a half-built index
+    os.replace(tmp_path, index_path)
+    return count
+
+
+if __name__ == "__main__":
+    # python -m app.services.learning_resources courses.jsonl
+    parser = argparse.ArgumentParser(description="Build the offline course index")
+    parser.add_argument("source", help="JSONL file of skill/title/url records")
+    parser.add_argument("--out", default=settings.LEARNING_INDEX_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    rows = build_index(args.source, args.out)
+    logger.info(f"Indexed {rows} courses into {args.out}")
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+from app.core.config import settings
+from app.core.observability import llm_cache_hit_counter, llm_cache_miss_counter
+from app.models.embedder import get_job_embedder
+from app.services.redis_cache import content_hash, generate_cache_key
+
+logger = logging.getLogger("nexus-talent")
+
+# Characters per embedded chunk; keeps each chunk inside the bi-encoder window
+EMBED_CHUNK_CHARS = 1000
+
+
+def exact_key(model: str, system_instruction: str, prompt: str) -> str:
+    """
+    Exact tier: the same model, instructions and prompt give the same answer.
+    Entries record their serving model; fallback answers are never stored.
+    """
+    return generate_cache_key(
+        "llm_v2", content_hash(model), content_hash(system_instruction), prompt
+    )
+
+
+def semantic_namespace(model: str, system_instruction: str) -> str:
+    """Semantic neighbours only count under identical model and instructions."""
+    return content_hash(model, system_instruction)
+
+
+def _embed_documents(texts: Sequence[str]) -> np.ndarray:
+    """
+    One L2-normalized vector per document. Long documents are split into
+    chunks and mean-pooled, so text past the model window still counts.
+    """
+    chunks, owners = [], []
+    for i, text in enumerate(texts):
+        text = text or ""
+        pieces = [
+            text[j : j + EMBED_CHUNK_CHARS]
+            for j in range(0, len(text), EMBED_CHUNK_CHARS)
+        ] or [""]
+        chunks.extend(pieces)
+        owners.extend([i] * len(pieces))
+
+    vectors = get_job_embedder().embed(chunks)
+    pooled = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+    np.add.at(pooled, owners, vectors)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return pooled / np.maximum(norms, 1e-12)
+
+
+class SemanticResponseCache:
+    """
+    In-process nearest-neighbour cache of validated LLM responses.
+    An entry matches when EVERY input (e.g. resume and JD) is at least
+    `threshold` cosine-similar to the stored one; a near-identical resume
+    against a different JD is not a hit. Entries expire after `ttl` and the
+    least-recently-used is evicted beyond `max_entries`.
+    """
+
+    def __init__(self, threshold: float, max_entries: int, ttl: int):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[str, float, np.ndarray, Any]]" = (
+            OrderedDict()
+        )
+        self._next_id = 0
+
+    def lookup(self, namespace: str, vectors: np.ndarray) -> Optional[Any]:
+        now = time.monotonic()
+        for entry_id in [i for i, e in self._entries.items() if e[1] <= now]:
+            del self._entries[entry_id]
+
+        candidates = [
+            (entry_id, entry)
+            for entry_id, entry in self._entries.items()
+            if entry[0] == namespace
+        ]
+        if not candidates:
+            return None
+
+        stored = np.stack([entry[2] for _, entry in candidates])  # (n, inputs, dim)
+        # Per-input cosine, then the weakest input decides the match
+        similarity = np.einsum("nid,id->ni", stored, vectors).min(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            return None
+
+        entry_id, entry = candidates[best]
+        self._entries.move_to_end(entry_id)
+        return entry[3]
+
+    def add(self, namespace: str, vectors: np.ndarray, value: Any):
+        self._entries[self._next_id] = (
+            namespace,
+            time.monotonic() + self.ttl,
+            vectors,
+            value,
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class LLMResponseCache:
+    """
+    Response cache in front of the LLM router.
+    Exact tier: shared two-tier Redis cache keyed by exact_key(), written by
+    the caller through compute_once so only validated responses are stored.
+    Semantic tier (optional): reuses a validated response for near-identical
+    inputs, looked up only after an exact miss.
+    """
+
+    def __init__(self):
+        self.semantic_enabled = settings.LLM_SEMANTIC_CACHE_ENABLED
+        self.semantic = SemanticResponseCache(
+            threshold=settings.LLM_SEMANTIC_THRESHOLD,
+            max_entries=settings.LLM_SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl=settings.LLM_SEMANTIC_CACHE_TTL,
+        )
+
+    async def embed_inputs(self, inputs: Sequence[str]) -> Optional[np.ndarray]:
+        """Input vectors for the semantic tier, or None when it is off/unavailable."""
+        if not self.semantic_enabled:
+            return None
+        try:
+            return await asyncio.to_thread(_embed_documents, inputs)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+
+    def lookup_similar(
+        self, namespace: str, vectors: Optional[np.ndarray]
+    ) -> Optional[Any]:
+        if vectors is None:
+            return None
+        value = self.semantic.lookup(namespace, vectors)
+        self.record("semantic", value is not None)
+        return value
+
+    def remember(self, namespace: str, vectors: Optional[np.ndarray], value: Any):
+        if vectors is not None and value is not None:
+            self.semantic.add(namespace, vectors, value)
+
+    @staticmethod
+    def record(tier: str, hit: bool):
+        counter = llm_cache_hit_counter if hit else llm_cache_miss_counter
+        counter.add(1, {"tier": tier})
+
+
+# Shared response cache (semantic tier is per worker process)
+llm_cache = LLMResponseCache()
@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from app.core.config import settings
+from app.core.observability import tracer
+from app.models.embedder import get_job_embedder
+
+logger = logging.getLogger("nexus-talent")
+
+VECTORS_FILE = "vectors.npy"
+JOBS_FILE = "jobs.json"
+
+
+class LocalJobIndex:
+    """
+    In-process brute-force vector index over L2-normalized job embeddings.
+    Vectors are memory-mapped read-only, so every gunicorn worker shares the
+    same page-cache copy. Same contract as the Weaviate query_similar_jobs.
+    """
+
+    def __init__(self, vectors: np.ndarray, jobs: List[Dict[str, Any]]):
+        if len(vectors) != len(jobs):
+            raise ValueError("Vector and job counts differ")
+        self.vectors = vectors
+        self.jobs = jobs
+        self._locations = [(j.get("location") or "").casefold() for j in jobs]
+
+    @classmethod
+    def load(cls, index_dir: str) -> "LocalJobIndex":
+        vectors = np.load(os.path.join(index_dir, VECTORS_FILE), mmap_mode="r")
+        with open(os.path.join(index_dir, JOBS_FILE), encoding="utf-8") as fh:
+            jobs = json.load(fh)
+        return cls(vectors, jobs)
+
+    def save(self, index_dir: str):
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, VECTORS_FILE), np.asarray(self.vectors))
+        with open(os.path.join(index_dir, JOBS_FILE), "w", encoding="utf-8") as fh:
+            json.dump(self.jobs, fh)
+
+    def search(
+        self, query_vector: np.ndarray, location: Optional[str] = None, limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Top-`limit` jobs by cosine similarity, optionally location-filtered."""
+        if not self.jobs:
+            return []
+        scores = self.vectors @ query_vector  # Cosine: both sides are normalized
+
+        if location and location.strip().lower() != "remote":
+            needle = location.strip().casefold()
+            mask = np.fromiter(
+                (needle in loc for loc in self._locations),
+                dtype=bool,
+                count=len(self._locations),
+            )
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {**self.jobs[i], "source": "local_index"}
+            for i in top
+            if np.isfinite(scores[i])
+        ]
+
+    async def query_similar_jobs(
+        self,
+        title: str,
+        skills: list,
+        location: Optional[str] = None,
+        limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        with tracer.start_as_current_span("local_index_query") as span:
+            span.set_attribute("index.size", len(self.jobs))
+            embedder = get_job_embedder()
+            vector = (
+                await asyncio.to_thread(
+                    embedder.embed, [embedder.query_text(title, skills)]
+                )
+            )[0]
+            results = self.search(vector, location, limit or settings.WEAVIATE_LIMIT)
+            span.set_attribute("index.match_count", len(results))
+            return results
+
+
+_index: Optional[LocalJobIndex] = None
+_index_lock = threading.Lock()
+_missing_logged = False
+
+
+def load_local_index() -> Optional[LocalJobIndex]:
+    """
+    Process-wide index, or None when disabled or not built yet (blocking).
+    Only a successful load is kept: until then every call re-checks the
+    directory, so an index built after startup is picked up.
+    """
+    global _index, _missing_logged
+    if _index is not None or not settings.LOCAL_INDEX_ENABLED:
+        return _index
+    with _index_lock:
+        if _index is None:
+            index_dir = settings.LOCAL_INDEX_DIR
+            if not os.path.exists(os.path.join(index_dir, VECTORS_FILE)):
+                if not _missing_logged:
+                    logger.warning(f"Local job index not found at {index_dir}")
+                    _missing_logged = True
+                return None
+            _index = LocalJobIndex.load(index_dir)
+    return _index
+
+
+async def get_local_index() -> Optional[LocalJobIndex]:
+    """load_local_index() for request paths: the first load runs off the loop."""
+    if _index is not None:
+        return _index
+    return await asyncio.to_thread(load_local_index)
+
+
+def build_index(source_path: str, index_dir: str) -> int:
+    """Embeds a JSONL file of postings into an on-disk index. Returns the count."""
+    jobs = []
+    with open(source_path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            job.setdefault("jd", job.get("description"))
+            jobs.append(
+                {k: job.get(k) for k in ("title", "company", "location", "jd", "link")}
+            )
+
+    embedder = get_job_embedder()
+    vectors = embedder.embed([embedder.job_text(j) for j in jobs])
+    LocalJobIndex(vectors, jobs).save(index_dir)
+    return len(jobs)
+
+
+if __name__ == "__main__":
+    # python -m app.services.local_index jobs.jsonl
+    parser = argparse.ArgumentParser(description="Build the local job vector index")
+    parser.add_argument("source", help="JSONL file of job postings")
+    parser.add_argument("--out", default=settings.LOCAL_INDEX_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = build_index(args.source, args.out)
+    logger.info(f"Indexed {count} jobs into {args.out}")
@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Iterator, List, Optional, Sequence, Union
+
+from pypdf import PdfReader
+from app.core.config import settings
+from app.core.security import security
+
+# Created lazily (after the gunicorn fork) with a forkserver context, so
+# children never inherit the parent's model threads or event loop.
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _pool
+
+
+def _iter_pages(file_bytes: bytes, max_pages: int, deadline: float) -> Iterator[str]:
+    """
+    Yields page text one page at a time, stopping at the page cap or at the
+    first page boundary past the deadline, so an abandoned document frees
+    its worker instead of running to completion.
+    """
+    reader = PdfReader(BytesIO(file_bytes))
+    for index, page in enumerate(reader.pages):
+        if index >= max_pages or time.time() > deadline:
+            break
+        yield page.extract_text() or ""
+
+
+def _extract_and_sanitize(file_bytes: bytes, max_pages: int, deadline: float) -> str:
+    """Runs in a worker process: pages stream straight into the sanitizer."""
+    return security.sanitize_input(_iter_pages(file_bytes, max_pages, deadline))
+
+
+def _recycle(pool: ProcessPoolExecutor):
+    """
+    Replaces the pool and kills its workers. A worker stuck inside one
+    pathological page never reaches the deadline check in _iter_pages, and
+    abandoning its future alone would hold the slot indefinitely.
+    """
+    global _pool
+    if _pool is pool:
+        _pool = None
+    if hasattr(pool, "terminate_workers"):  # Python 3.14+
+        pool.terminate_workers()
+        return
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+async def _run_with_budget(func, *args, deadline: float):
+    """
+    Runs func(*args, deadline) in the pool, recycling the pool if it overruns.
+    Work that merely shared a recycled pool is retried once on the new one.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        pool = _get_pool()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, func, *args, deadline), remaining
+            )
+        except asyncio.TimeoutError:
+            _recycle(pool)
+            raise
+        except BrokenProcessPool:
+            if attempt or pool is _pool:
+                raise  # Broken by a crash, not by another document's recycle
+
+
+async def extract_resume_text(file_bytes: bytes, timeout: float = None) -> str:
+    """
+    Extracts and sanitizes PDF text in the process pool.
+    Raises asyncio.TimeoutError if the document exceeds its time budget.
+    """
+    timeout = timeout or settings.PDF_TIMEOUT_S
+    return await _run_with_budget(
+        _extract_and_sanitize,
+        file_bytes,
+        settings.PDF_MAX_PAGES,
+        deadline=time.time() + timeout,
+    )
+
+
+async def extract_resume_texts(
+    files: Sequence[bytes],
+) -> List[Union[str, BaseException]]:
+    """Batch API for bulk imports: one result (or exception) per file, in order."""
+    return await asyncio.gather(
+        *(extract_resume_text(f) for f in files), return_exceptions=True
+    )
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
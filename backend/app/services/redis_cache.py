@@ -1,40 +1,314 @@
-import redis
-import json
+import asyncio
 import hashlib
-import os
-from typing import Any, Optional
-from app.core.observability import cache_hit_counter, cache_miss_counter
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from app.core.config import settings
+from app.services.cache_codec import codec
+from app.core.observability import (
+    cache_hit_counter,
+    cache_miss_counter,
+    l1_cache_hit_counter,
+    l1_cache_miss_counter,
+    cache_coalesced_counter,
+)
+
+logger = logging.getLogger("nexus-talent")
 
 # Configuration
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 CACHE_TTL = 3600  # 1 hour default
 
 
+class LocalCache:
+    """
+    L1: bounded in-process LRU holding serialized payloads.
+    Entries expire no later than their Redis TTL; storing the encoded bytes
+    (not the object) keeps callers from mutating each other's results.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, max_ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return raw
+
+    def set(self, key: str, raw: bytes, ttl: float):
+        self.delete(key)
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0 or len(raw) > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl, raw)
+        self._bytes += len(raw)
+        # Evict least-recently-used until both bounds hold
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+
 class CacheService:
-    def __init__(self):
-        self.client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    """
+    Two-tier cache: in-process LRU (L1) in front of async Redis (L2).
+    Every Redis operation fails open: errors/timeouts behave like a miss.
+    """
+
+    def __init__(self, url: str = None):
+        self.pool = redis.ConnectionPool.from_url(
+            url or settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_TIMEOUT_MS / 1000,
+            socket_connect_timeout=settings.REDIS_TIMEOUT_MS / 1000,
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
+        self.local = LocalCache(
+            max_entries=settings.L1_CACHE_MAX_ENTRIES,
+            max_bytes=settings.L1_CACHE_MAX_BYTES,
+            max_ttl=settings.L1_CACHE_MAX_TTL,
+        )
+        # Single-flight registry: key -> future of the in-progress computation
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     def _generate_key(self, prefix: str, data: str) -> str:
         """Creates a hashed key to prevent collision and handle long strings."""
         hash_val = hashlib.sha256(data.encode()).hexdigest()
         return f"{prefix}:{hash_val}"
 
-    def get(self, key: str) -> Optional[Any]:
-        """Retrieves data and updates observability metrics."""
+    def _decode(self, key: str, raw: bytes) -> Optional[Any]:
+        """Corrupt or unreadable payloads behave like a miss (and leave L1)."""
+        try:
+            return codec.decode(raw)
+        except Exception as e:
+            logger.warning(f"Cache decode failed for {key}, treating as miss: {e}")
+            self.local.delete(key)
+            return None
+
+    def _remaining_ttl(self, pttl: int) -> float:
+        """Redis PTTL -> seconds; -1 means no expiry, so fall back to the L1 cap."""
+        return self.local.max_ttl if pttl == -1 else pttl / 1000
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Retrieves data (L1, then Redis) and updates observability metrics."""
+        raw = self.local.get(key)
+        if raw is not None:
+            l1_cache_hit_counter.add(1)
+            return self._decode(key, raw)
+        l1_cache_miss_counter.add(1)
+
         try:
-            value = self.client.get(key)
+            # GET + PTTL in one round-trip so L1 never outlives the Redis entry
+            async with self.client.pipeline(transaction=False) as pipe:
+                value, pttl = await pipe.get(key).pttl(key).execute()
             if value:
                 cache_hit_counter.add(1)  # Tracks successful cache usage
-                return json.loads(value)
+                self.local.set(key, value, self._remaining_ttl(pttl))
+                return self._decode(key, value)
 
             cache_miss_counter.add(1)  # Tracks when system had to go to the API/DB
             return None
-        except redis.RedisError:
+        except RedisError as e:
+            logger.warning(f"Cache GET failed open: {e}")
             return None
 
-    def set(self, key: str, value: Any, ttl: int = CACHE_TTL):
-        """Stores data in Redis with an expiration time."""
+    async def set(self, key: str, value: Any, ttl: int = CACHE_TTL):
+        """Stores data in both tiers with an expiration time."""
+        raw = codec.encode(value)
+        self.local.set(key, raw, ttl)
         try:
-            self.client.setex(key, ttl, json.dumps(value))
-        except redis.RedisError:
-            pass  # In production, we log this but don't crash the app
+            await self.client.setex(key, ttl, raw)
+        except RedisError as e:
+            logger.warning(f"Cache SET failed open: {e}")
+
+    # --- Mutable records (Redis only: L1 would serve stale state) ---
+
+    async def get_record(self, key: str) -> Optional[Any]:
+        try:
+            value = await self.client.get(key)
+            return self._decode(key, value) if value else None
+        except RedisError as e:
+            logger.warning(f"Record GET failed open: {e}")
+            return None
+
+    async def set_record(
+        self, key: str, value: Any, ttl: int = CACHE_TTL, only_if_absent: bool = False
+    ) -> bool:
+        """Writes a record; with only_if_absent, returns False if it already exists."""
+        try:
+            written = await self.client.set(
+                key, codec.encode(value), ex=ttl, nx=only_if_absent
+            )
+            return bool(written)
+        except RedisError as e:
+            logger.warning(f"Record SET failed open: {e}")
+            return True
+
+    async def delete_record(self, key: str):
+        try:
+            await self.client.delete(key)
+        except RedisError as e:
+            logger.warning(f"Record DELETE failed: {e}")
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Bulk lookup (L1 first, one Redis round-trip for the rest)."""
+        if not keys:
+            return []
+        raws: List[Optional[bytes]] = [self.local.get(k) for k in keys]
+        missing = [i for i, raw in enumerate(raws) if raw is None]
+        l1_cache_hit_counter.add(len(keys) - len(missing))
+        l1_cache_miss_counter.add(len(missing))
+
+        if missing:
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    pipe.mget([keys[i] for i in missing])
+                    for i in missing:
+                        pipe.pttl(keys[i])
+                    values, *pttls = await pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Cache MGET failed open: {e}")
+                values, pttls = [None] * len(missing), [0] * len(missing)
+
+            hits = sum(1 for v in values if v)
+            cache_hit_counter.add(hits)
+            cache_miss_counter.add(len(missing) - hits)
+            for i, value, pttl in zip(missing, values, pttls):
+                if value:
+                    raws[i] = value
+                    self.local.set(keys[i], value, self._remaining_ttl(pttl))
+
+        return [
+            self._decode(key, raw) if raw else None for key, raw in zip(keys, raws)
+        ]
+
+    async def mset(self, items: Dict[str, Any], ttl: int = CACHE_TTL):
+        """Bulk write with per-key TTL via a single pipelined round-trip."""
+        if not items:
+            return
+        encoded = {key: codec.encode(value) for key, value in items.items()}
+        for key, raw in encoded.items():
+            self.local.set(key, raw, ttl)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, raw in encoded.items():
+                    pipe.setex(key, ttl, raw)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Cache MSET failed open: {e}")
+
+    async def compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = CACHE_TTL,
+        should_cache: Callable[[Any], bool] = None,
+    ) -> Any:
+        """
+        Single-flight: concurrent misses on `key` share one `compute()` call.
+        The leader stores the result in both tiers (unless `should_cache`
+        rejects it, e.g. a degraded answer); followers await it either way.
+        If the leader is cancelled (its client disconnected), one follower
+        becomes the new leader instead of every follower failing with the
+        leader's CancelledError; a follower that is itself cancelled re-raises.
+        """
+        while (inflight := self._inflight.get(key)) is not None:
+            cache_coalesced_counter.add(1)
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # Leader gone: loop to follow whoever took over, or lead
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved even when nobody else was waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await compute()
+            if value is not None and (should_cache is None or should_cache(value)):
+                await self.set(key, value, ttl=ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def close(self):
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+
+# Shared cache instance (one pool per worker process)
+cache = CacheService()
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(*parts: Optional[str]) -> str:
+    """
+    SHA-256 over the full, normalized content (case-folded, whitespace
+    collapsed). Stable across formatting-only differences, never truncated.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        normalized = _WHITESPACE.sub(" ", (part or "").casefold()).strip()
+        digest.update(normalized.encode())
+        digest.update(b"\x1f")  # Unit separator: ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+def generate_cache_key(prefix: str, *parts: Any) -> str:
+    """Namespaced SHA-256 key over all parts (None-safe)."""
+    data = "|".join("" if p is None else str(p) for p in parts)
+    return cache._generate_key(prefix, data)
+
+
+async def get_cache(key: str) -> Optional[Any]:
+    return await cache.get(key)
+
+
+async def set_cache(key: str, value: Any, ttl: int = CACHE_TTL):
+    await cache.set(key, value, ttl=ttl)
+
+
+async def mget_cache(keys: Sequence[str]) -> List[Optional[Any]]:
+    return await cache.mget(keys)
+
+
+async def mset_cache(items: Dict[str, Any], ttl: int = CACHE_TTL):
+    await cache.mset(items, ttl=ttl)
+
+
+async def compute_once(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int = CACHE_TTL,
+    should_cache: Callable[[Any], bool] = None,
+) -> Any:
+    return await cache.compute_once(
+        key, compute, ttl=ttl, should_cache=should_cache
+    )
@@ -1,21 +1,63 @@
+import asyncio
 import logging
-from io import BytesIO
-from pypdf import PdfReader
+from functools import lru_cache
 import instructor
-import google.generativeai as genai
 
 from app.api.schemas import ResumeData
 from app.core.security import security  # Professional sanitization
 from app.core.config import settings  # Pydantic settings
 from app.core.observability import tracer  # Real-time tracing
+from app.llm.gemini import get_model
+from app.llm.router import estimate_tokens, llm_router
+from app.services.pdf_extractor import extract_resume_text
 
 logger = logging.getLogger("nexus-talent")
 
-# Patch the Gemini client for structured outputs
-client = instructor.from_gemini(
-    client=genai.GenerativeModel(model_name="gemini-1.5-flash"),
-    mode=instructor.Mode.GEMINI_JSON,
+RESUME_SYSTEM_PROMPT = (
+    "You are a professional resume parser. Extract details accurately into JSON."
 )
+MAX_RESUME_CHARS = 12000  # Resume text sent per extraction
+
+
+@lru_cache(maxsize=1)
+def get_extraction_client():
+    """
+    Patches the shared Gemini model for structured outputs, once per process.
+    Reuses the same configured GenerativeModel cache as the LLM router.
+    """
+    return instructor.from_gemini(
+        client=get_model(settings.GEMINI_MODEL),
+        mode=instructor.Mode.GEMINI_JSON,
+        use_async=True,
+    )
+
+
+async def extract_structured(response_model, user_prompt: str):
+    """
+    One structured-extraction call under the shared Gemini gate, so it counts
+    against the same RPM/TPM buckets, slots and breaker as routed calls.
+    Waits for quota rather than failing; callers bound the wait.
+    """
+    gate = llm_router.gates["gemini"]
+    await gate.acquire(estimate_tokens(user_prompt, RESUME_SYSTEM_PROMPT))
+    try:
+        result = await get_extraction_client().chat.completions.create(
+            response_model=response_model,
+            messages=[
+                {"role": "system", "content": RESUME_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
+    except asyncio.CancelledError:
+        gate.breaker.release_probe()
+        raise
+    except Exception:
+        gate.breaker.record_failure()
+        raise
+    finally:
+        gate.release()
+    gate.breaker.record_success()
+    return result
 
 
 async def parse_resume_pdf(file_bytes: bytes) -> ResumeData:
@@ -29,14 +71,10 @@ async def parse_resume_pdf(file_bytes: bytes) -> ResumeData:
             # Protects your infrastructure from DoS attacks
             security.validate_file_size(len(file_bytes))
 
-            # 2. Safe Extraction
-            # Uses BytesIO to handle files in-memory (Standard for Cloud/Docker)
-            reader = PdfReader(BytesIO(file_bytes))
-            raw_text = "".join([page.extract_text() or "" for page in reader.pages])
-
-            # 3. Sanitization
-            # Neutralizes malicious strings and artifacts before LLM processing
-            sanitized_text = security.sanitize_input(raw_text)
+            # 2. Safe Extraction + 3. Sanitization
+            # CPU-bound pypdf work runs in a process pool with a time budget
+            # and page cap; pages are sanitized as they are extracted
+            sanitized_text = await extract_resume_text(file_bytes)
 
             if not sanitized_text:
                 raise ValueError("Could not extract valid text from the provided PDF.")
@@ -44,19 +82,12 @@ async def parse_resume_pdf(file_bytes: bytes) -> ResumeData:
             span.set_attribute("resume.char_count", len(sanitized_text))
 
             # 4. Structured Extraction via Instructor
-            # Converts raw text into a validated Pydantic ResumeData object
-            resume_object = await client.chat.completions.create(
-                response_model=ResumeData,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional resume parser. Extract details accurately into JSON.",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Extract details from this resume: {sanitized_text[:12000]}",
-                    },
-                ],
+            # Converts raw text into a validated Pydantic ResumeData object;
+            # the parse node's budget bounds the wait for Gemini quota
+            resume_object = await extract_structured(
+                ResumeData,
+                "Extract details from this resume: "
+                + sanitized_text[:MAX_RESUME_CHARS],
             )
 
             logger.info("Resume successfully parsed and structured.")
@@ -1,22 +1,132 @@
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
 import weaviate
+from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.classes.query import Filter
 from app.core.config import settings
+from app.core.observability import tracer
+from app.models.embedder import get_job_embedder
+
+logger = logging.getLogger("nexus-talent")
+
+JOB_COLLECTION = "Job"
+JOB_PROPERTIES = ["title", "company", "location", "description", "link"]
+_WORD = re.compile(r"[^\W_]+")  # Weaviate's "word" tokenization: alphanumeric runs
+
 
-client = weaviate.Client(url=settings.WEAVIATE_URL)
+def _to_job(props: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a Job object onto the standard sourcing shape used by every agent."""
+    return {
+        "title": props.get("title"),
+        "company": props.get("company"),
+        "location": props.get("location"),
+        "jd": props.get("description"),
+        "link": props.get("link"),
+        "source": "weaviate",
+    }
 
 
-async def query_similar_jobs(title: str, skills: list):
+class WeaviateService:
     """
-    RAG Retrieval Step: Finds the most relevant job descriptions
-    based on the candidate's specific skill vector.
+    Async Weaviate v4 retrieval service.
+    One pooled connection per worker, opened in the app lifespan.
     """
-    # Hybrid search: Vectorizes 'skills' + Matches 'title' keywords
-    response = (
-        client.query.get("Job", ["title", "company", "description"])
-        .with_hybrid(
-            query=f"{title} {' '.join(skills)}",
-            alpha=0.75,  # Heavily weight semantic similarity
+
+    def __init__(self, url: str = None, grpc_port: int = None):
+        parsed = urlparse(url or settings.WEAVIATE_URL)
+        self.client = weaviate.use_async_with_custom(
+            http_host=parsed.hostname,
+            http_port=parsed.port or (443 if parsed.scheme == "https" else 80),
+            http_secure=parsed.scheme == "https",
+            grpc_host=parsed.hostname,
+            grpc_port=grpc_port or settings.WEAVIATE_GRPC_PORT,
+            grpc_secure=parsed.scheme == "https",
+            additional_config=AdditionalConfig(
+                timeout=Timeout(init=5, query=settings.WEAVIATE_QUERY_TIMEOUT_S)
+            ),
+            skip_init_checks=True,
         )
-        .with_limit(5)
-        .do()
+        self._connect_lock = asyncio.Lock()
+
+    async def connect(self):
+        async with self._connect_lock:
+            if not self.client.is_connected():
+                await self.client.connect()
+
+    async def close(self):
+        await self.client.close()
+
+    async def query_similar_jobs(
+        self,
+        title: str,
+        skills: list,
+        location: Optional[str] = None,
+        alpha: float = None,
+        limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        RAG Retrieval Step: Finds the most relevant job descriptions
+        based on the candidate's specific skill vector.
+        """
+        with tracer.start_as_current_span("weaviate_hybrid_query") as span:
+            span.set_attribute("db.system", "weaviate")
+            try:
+                await self.connect()
+                embedder = get_job_embedder()
+                query = embedder.query_text(title, skills)
+                # No server-side vectorizer: embed the query with the index model
+                vector = (await asyncio.to_thread(embedder.embed, [query]))[0]
+
+                jobs = self.client.collections.get(JOB_COLLECTION)
+                # Hybrid search: Vectorizes 'skills' + Matches 'title' keywords
+                response = await jobs.query.hybrid(
+                    query=query,
+                    vector=vector.tolist(),
+                    alpha=alpha if alpha is not None else settings.WEAVIATE_ALPHA,
+                    limit=limit or settings.WEAVIATE_LIMIT,
+                    filters=self._location_filter(location),
+                    return_properties=JOB_PROPERTIES,
+                )
+                results = [_to_job(obj.properties) for obj in response.objects]
+                span.set_attribute("weaviate.match_count", len(results))
+                return results
+
+            except Exception as e:
+                span.record_exception(e)
+                logger.error(f"Weaviate query failed: {str(e)}")
+                return []
+
+    @staticmethod
+    def _location_filter(location: Optional[str]):
+        """
+        Pushes the location constraint into the query ("Remote"/empty = any).
+        `location` is word-tokenized, so match the tokens of its most specific
+        part ("San Francisco" of "San Francisco, CA") rather than the raw
+        input, whose spaces and commas never match a single token.
+        """
+        if not location or location.strip().lower() == "remote":
+            return None
+        tokens = _WORD.findall(location.split(",")[0].casefold())
+        if not tokens:
+            return None
+        return Filter.by_property("location").contains_all(tokens)
+
+
+# Shared service instance (connected in the app lifespan)
+weaviate_service = WeaviateService()
+
+
+async def query_similar_jobs(
+    title: str,
+    skills: list,
+    location: Optional[str] = None,
+    alpha: float = None,
+    limit: int = None,
+) -> List[Dict[str, Any]]:
+    return await weaviate_service.query_similar_jobs(
+        title=title, skills=skills, location=location, alpha=alpha, limit=limit
     )
-    return response["data"]["Get"]["Job"]
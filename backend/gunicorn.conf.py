@@ -0,0 +1,49 @@
+import gc
+import os
+
+# --- Gunicorn Production Config ---
+# The app (and with it the cross-encoder weights) is imported once in the
+# master, the job embedder is loaded in when_ready, and both are inherited
+# by every worker through fork(), so the model pages are shared
+# copy-on-write instead of loaded once per worker.
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def when_ready(server):
+    # Runs in the master after the preload, before any worker is forked.
+    # Nothing imports the retrieval bi-encoder or the local job index
+    # eagerly, so load them here to share them like the cross-encoder.
+    if preload_app:
+        from app.models.embedder import get_job_embedder
+        from app.services.local_index import load_local_index
+
+        get_job_embedder()
+        load_local_index()
+
+
+def pre_fork(server, worker):
+    # Move everything allocated during preload into the permanent generation
+    # so the GC in each worker never writes to (and un-shares) those pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # OTLP exporter threads and gRPC channels do not survive fork(); each
+    # worker builds its own (the master only ever holds the API proxies).
+    from app.core.observability import setup_telemetry
+
+    setup_telemetry()
+
+    # Split the CPU between workers rather than letting each one spawn a
+    # full set of intra-op threads for the shared model.
+    try:
+        import torch
+
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+    except ImportError:
+        pass
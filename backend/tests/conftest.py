@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+# Settings() requires a key; tests never reach the real API
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """The shared cache service backed by an in-memory Redis, with a cold L1."""
+    import fakeredis
+
+    from app.services.redis_cache import LocalCache, cache
+
+    client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(cache, "client", client)
+    monkeypatch.setattr(
+        cache, "local", LocalCache(max_entries=128, max_bytes=1 << 20, max_ttl=300)
+    )
+    monkeypatch.setattr(cache, "_inflight", {})
+    return client
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.services.analysis_queue import AnalysisQueue, analysis_job_id
+from app.services.redis_cache import cache
+
+PAYLOAD = {"resume": "Python developer", "job_title": "Engineer", "location": "Remote"}
+JOB_ID = analysis_job_id(PAYLOAD)
+
+
+@pytest.fixture
+def queue(fake_redis):
+    # No workers: runs stay queued so the test can count them
+    queue = AnalysisQueue(workers=1, max_size=10)
+    queue._queue = asyncio.PriorityQueue(maxsize=10)
+    return queue
+
+
+async def seed(queue, status):
+    await cache.set_record(
+        queue._key(JOB_ID), {"id": JOB_ID, "status": status, "submitted_at": 0}
+    )
+
+
+def test_duplicate_submits_share_one_run(queue):
+    async def scenario():
+        return await asyncio.gather(queue.submit(PAYLOAD), queue.submit(PAYLOAD))
+
+    first, second = asyncio.run(scenario())
+    assert first["id"] == second["id"] == JOB_ID
+    assert queue._queue.qsize() == 1
+
+
+@pytest.mark.parametrize("status", ["running", "queued", "failed"])
+def test_concurrent_takeover_enqueues_exactly_one_run(queue, status):
+    async def scenario():
+        await seed(queue, status)  # Orphaned or failed: no lease
+        return await asyncio.gather(*(queue.submit(PAYLOAD) for _ in range(5)))
+
+    records = asyncio.run(scenario())
+    assert queue._queue.qsize() == 1
+    assert all(r["id"] == JOB_ID for r in records)
+
+
+def test_live_owner_is_not_taken_over(queue):
+    async def scenario():
+        await seed(queue, "running")
+        await queue._renew_lease(JOB_ID)  # Owner still heartbeating
+        return await queue.submit(PAYLOAD)
+
+    assert asyncio.run(scenario())["status"] == "running"
+    assert queue._queue.qsize() == 0
+
+
+def test_done_job_is_returned_without_a_run(queue, fake_redis):
+    async def scenario():
+        await seed(queue, "done")
+        record = await queue.submit(PAYLOAD)
+        return record, await fake_redis.exists(queue._lease_key(JOB_ID))
+
+    record, lease_left = asyncio.run(scenario())
+    assert record["status"] == "done"
+    assert queue._queue.qsize() == 0
+    assert not lease_left
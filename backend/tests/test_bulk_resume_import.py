@@ -0,0 +1,73 @@
+import asyncio
+
+from app.api.schemas import ResumeData
+from app.core.config import settings
+from app.services import bulk_resume_import as bulk
+from app.services.resume_parser import MAX_RESUME_CHARS
+
+
+def test_pack_bounds_batches_by_count(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "BULK_BATCH_MAX_CHARS", 10_000)
+    batches = bulk._pack([(i, "text") for i in range(5)])
+    assert [[pos for pos, _ in b] for b in batches] == [[0, 1], [2, 3], [4]]
+
+
+def test_pack_bounds_batches_by_characters(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_BATCH_SIZE", 10)
+    monkeypatch.setattr(settings, "BULK_BATCH_MAX_CHARS", 10)
+    batches = bulk._pack([(0, "a" * 6), (1, "b" * 4), (2, "c" * 1), (3, "d" * 20)])
+    # An oversized resume still gets a batch of its own
+    assert [[pos for pos, _ in b] for b in batches] == [[0, 1], [2], [3]]
+
+
+def test_pack_truncates_long_resumes(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_BATCH_MAX_CHARS", 10 * MAX_RESUME_CHARS)
+    [[(_, text)]] = bulk._pack([(0, "x" * (MAX_RESUME_CHARS + 50))])
+    assert len(text) == MAX_RESUME_CHARS
+
+
+def fake_extraction(monkeypatch, batched_indexes, batch_error=None, fail=()):
+    """Batched answers cover `batched_indexes`; single calls echo the text."""
+    calls = []
+
+    async def extract_structured(response_model, prompt):
+        calls.append(response_model)
+        if response_model is bulk.ResumeBatch:
+            if batch_error:
+                raise batch_error
+            return bulk.ResumeBatch(
+                resumes=[
+                    bulk.BatchedResume(index=i, resume=ResumeData(name=f"batched{i}"))
+                    for i in batched_indexes
+                ]
+            )
+        text = prompt.rsplit(": ", 1)[1]
+        if text in fail:
+            raise ValueError(f"unparseable {text}")
+        return ResumeData(name=f"single:{text}")
+
+    monkeypatch.setattr(bulk, "extract_structured", extract_structured)
+    return calls
+
+
+def test_entries_missing_from_batched_answer_are_retried_singly(monkeypatch):
+    # Index 1 is dropped and index 7 is out of range: only resume 1 is retried
+    calls = fake_extraction(monkeypatch, batched_indexes=[0, 2, 7])
+    batch = [(10, "r0"), (11, "r1"), (12, "r2")]
+    results = asyncio.run(bulk._extract_batch(batch))
+    assert {pos: r.name for pos, r in results.items()} == {
+        10: "batched0",
+        11: "single:r1",
+        12: "batched2",
+    }
+    assert calls == [bulk.ResumeBatch, ResumeData]
+
+
+def test_failed_batch_call_retries_every_resume(monkeypatch):
+    fake_extraction(
+        monkeypatch, batched_indexes=[], batch_error=RuntimeError("boom"), fail={"r1"}
+    )
+    results = asyncio.run(bulk._extract_batch([(0, "r0"), (1, "r1")]))
+    assert results[0].name == "single:r0"
+    assert isinstance(results[1], ValueError)
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import pytest
+
+from app.services import cache_codec
+from app.services.cache_codec import CacheCodec
+
+VALUE = {
+    "score": 87,
+    "jobs": [{"title": "Engineer", "jd": "Python " * 400, "link": None}],
+    "ratio": 0.5,
+    "unicode": "Zürich ✓ 🚀",
+    "flags": [True, False],
+}
+
+
+@pytest.mark.parametrize("fmt", ["orjson", "json", "msgpack"])
+@pytest.mark.parametrize("compression", ["zstd", "lz4", "zlib", "none"])
+@pytest.mark.parametrize("min_bytes", [0, 1 << 20])  # Compressed / stored raw
+def test_round_trip(fmt, compression, min_bytes):
+    codec = CacheCodec(fmt=fmt, compression=compression, compress_min_bytes=min_bytes)
+    raw = codec.encode(VALUE)
+    assert raw[0] == cache_codec.MAGIC | cache_codec.WIRE_VERSION
+    assert codec.decode(raw) == VALUE
+
+
+@pytest.mark.parametrize("fmt", ["orjson", "msgpack"])
+def test_entries_decode_across_configurations(fmt):
+    # The header, not the reader's settings, decides how to decode
+    raw = CacheCodec(fmt=fmt, compression="lz4", compress_min_bytes=0).encode(VALUE)
+    assert CacheCodec(fmt="json", compression="none").decode(raw) == VALUE
+
+
+@pytest.mark.parametrize("legacy", [VALUE, 42, "text", None, [1, 2]])
+def test_legacy_json_entries(legacy):
+    raw = json.dumps(legacy).encode()
+    assert CacheCodec().decode(raw) == legacy
+
+
+def test_unknown_version_byte_is_rejected():
+    raw = CacheCodec().encode(VALUE)
+    with pytest.raises(ValueError, match="wire version"):
+        CacheCodec().decode(bytes((cache_codec.MAGIC | 0x0F,)) + raw[1:])
+
+
+def test_unknown_format_is_rejected():
+    raw = CacheCodec().encode(VALUE)
+    with pytest.raises(ValueError, match="format"):
+        CacheCodec().decode(raw[:1] + bytes((0x0F,)) + raw[2:])
+
+
+def test_missing_library_falls_back_with_a_warning(monkeypatch, caplog):
+    monkeypatch.setattr(cache_codec, "msgpack", None)
+    monkeypatch.setattr(cache_codec, "lz4_frame", None)
+    with caplog.at_level(logging.WARNING, logger="nexus-talent"):
+        codec = CacheCodec(fmt="msgpack", compression="lz4")
+    assert codec.format == cache_codec.FORMAT_JSON
+    assert codec.compression == cache_codec.COMPRESS_ZLIB
+    assert "CACHE_CODEC=msgpack but msgpack is not installed" in caplog.text
+    assert "CACHE_COMPRESSION=lz4 but lz4 is not installed" in caplog.text
+    assert codec.decode(codec.encode(VALUE)) == VALUE
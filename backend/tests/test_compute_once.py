@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.services.redis_cache import cache
+
+
+class Compute:
+    """Counts calls; each call waits on `gate` before answering."""
+
+    def __init__(self, result="value", error=None):
+        self.calls = 0
+        self.result, self.error = result, error
+        self.gate = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.gate.wait()
+        if self.error:
+            raise self.error
+        return f"{self.result}-{self.calls}"
+
+
+async def start(compute, n, **kwargs):
+    """Leader first, then n-1 followers, all parked on the in-flight call."""
+    tasks = [asyncio.create_task(cache.compute_once("k", compute, **kwargs))]
+    await asyncio.sleep(0)
+    tasks += [
+        asyncio.create_task(cache.compute_once("k", compute, **kwargs))
+        for _ in range(n - 1)
+    ]
+    await asyncio.sleep(0)
+    return tasks
+
+
+def test_leader_success_is_shared_and_stored(fake_redis):
+    async def scenario():
+        compute = Compute()
+        tasks = await start(compute, 5)
+        compute.gate.set()
+        return await asyncio.gather(*tasks), compute.calls, await cache.get("k")
+
+    results, calls, stored = asyncio.run(scenario())
+    assert results == ["value-1"] * 5
+    assert calls == 1
+    assert stored == "value-1"
+    assert cache._inflight == {}
+
+
+def test_rejected_value_is_shared_but_not_stored(fake_redis):
+    async def scenario():
+        compute = Compute()
+        tasks = await start(compute, 3, should_cache=lambda value: False)
+        compute.gate.set()
+        return await asyncio.gather(*tasks), await cache.get("k")
+
+    results, stored = asyncio.run(scenario())
+    assert results == ["value-1"] * 3
+    assert stored is None
+
+
+def test_leader_exception_reaches_every_follower(fake_redis):
+    async def scenario():
+        compute = Compute(error=RuntimeError("upstream down"))
+        tasks = await start(compute, 4)
+        compute.gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return results, compute.calls, await cache.get("k")
+
+    results, calls, stored = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert calls == 1
+    assert stored is None
+    assert cache._inflight == {}
+
+
+def test_cancelled_leader_is_replaced_by_one_follower(fake_redis):
+    async def scenario():
+        compute = Compute()
+        leader, *followers = await start(compute, 4)
+        leader.cancel()
+        await asyncio.sleep(0.01)  # A follower takes over and calls compute
+        compute.gate.set()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results, compute.calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == ["value-2"] * 3  # Second call, made by the new leader
+    assert calls == 2
+    assert cache._inflight == {}
+
+
+def test_cancelled_follower_leaves_the_flight_alone(fake_redis):
+    async def scenario():
+        compute = Compute()
+        leader, cancelled, follower = await start(compute, 3)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        compute.gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await leader, await follower, compute.calls
+
+    assert asyncio.run(scenario()) == ("value-1", "value-1", 1)
+
+
+def test_leader_and_follower_cancelled_together(fake_redis):
+    async def scenario():
+        compute = Compute()
+        leader, cancelled, follower = await start(compute, 3)
+        leader.cancel()
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        compute.gate.set()
+        results = await asyncio.gather(leader, cancelled, return_exceptions=True)
+        return results, await follower, compute.calls
+
+    (leader, cancelled), value, calls = asyncio.run(scenario())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert (value, calls) == ("value-2", 2)
@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_clients import CountingTransport, HttpClientRegistry, UPSTREAMS
+
+
+def client_for(handler):
+    transport = CountingTransport(httpx.MockTransport(handler))
+    return httpx.AsyncClient(transport=transport), transport
+
+
+def test_request_counts_until_its_body_is_closed():
+    async def scenario():
+        client, transport = client_for(lambda request: httpx.Response(200, text="ok"))
+        async with client.stream("GET", "http://upstream/jobs") as response:
+            during = transport.in_flight
+            body = await response.aread()
+        after = transport.in_flight
+        await client.get("http://upstream/jobs")  # Non-streaming closes at once
+        return during, body, after, transport.in_flight
+
+    assert asyncio.run(scenario()) == (1, b"ok", 0, 0)
+
+
+def test_failed_request_is_released():
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def scenario():
+        client, transport = client_for(refuse)
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://upstream/jobs")
+        return transport.in_flight
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_registry_reports_every_open_upstream():
+    async def scenario():
+        registry = HttpClientRegistry(UPSTREAMS)
+        await registry.start()
+        sizes = registry.in_flight()
+        await registry.close()
+        return sizes, registry.in_flight()
+
+    sizes, after_close = asyncio.run(scenario())
+    assert sizes == {name: 0 for name in UPSTREAMS}
+    assert after_close == {}
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.services import job_stream
+
+
+class FakeProvider:
+    def __init__(self, name, jobs, delay=0.0):
+        self.name, self.jobs, self.delay = name, jobs, delay
+
+    async def fetch(self, title, location):
+        await asyncio.sleep(self.delay)
+        for job in self.jobs:
+            yield {**job, "source": self.name}
+
+
+async def collect(providers, deadline_ms=1000):
+    return [
+        job
+        async for job in job_stream.stream_jobs(
+            "dev", "any", providers=providers, deadline_ms=deadline_ms
+        )
+    ]
+
+
+def test_dedup_across_providers_keeps_other_locations():
+    a = FakeProvider("a", [{"title": "Dev", "company": "Acme", "location": "NYC"}])
+    b = FakeProvider(
+        "b",
+        [
+            {"title": "dev ", "company": "ACME", "location": "nyc"},  # Syndicated
+            {"title": "Dev", "company": "Acme", "location": "SF"},  # Distinct job
+        ],
+    )
+    jobs = asyncio.run(collect([a, b]))
+    assert [(j["source"], j["location"]) for j in jobs] == [("a", "NYC"), ("b", "SF")]
+
+
+def test_dedup_by_link():
+    a = FakeProvider("a", [{"title": "Dev", "link": "https://x.io/1/"}])
+    b = FakeProvider("b", [{"title": "Engineer", "link": "https://X.io/1"}])
+    assert len(asyncio.run(collect([a, b]))) == 1
+
+
+def test_deadline_returns_what_has_arrived():
+    fast = FakeProvider("fast", [{"title": "Dev", "company": "A"}])
+    slow = FakeProvider("slow", [{"title": "Ops", "company": "B"}], delay=5)
+    jobs = asyncio.run(collect([fast, slow], deadline_ms=200))
+    assert [j["source"] for j in jobs] == ["fast"]
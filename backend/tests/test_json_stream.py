@@ -0,0 +1,92 @@
+import json
+import random
+
+import pytest
+
+from app.llm.json_stream import JSONFieldStream
+
+DOCUMENT = {
+    "hard_skills": [
+        {"skill": "Kubernetes", "importance": "high", "tags": ["ops", "k8s"]},
+        {"skill": "Go", "importance": "medium", "tags": []},
+    ],
+    "summary": 'Needs "cloud" {infra} [depth], a \\ backslash, and \\"edge\\" cases',
+    "nested": {"a": {"b": [1, [2, {"c": "}]"}]]}, "d": None},
+    "unicode": "naïve résumé 🚀  ",
+    "priority_focus": "Kubernetes",
+    "score": 72.5,
+    "remote": True,
+    "empty": {},
+}
+
+
+def feed_all(parser, chunks):
+    members = []
+    for chunk in chunks:
+        members.extend(parser.feed(chunk))
+    return members
+
+
+def random_chunks(text, rng):
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 30)))
+    bounds = [0, *cuts, len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_random_chunk_splits_yield_every_member_in_order(indent, ensure_ascii):
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=ensure_ascii)
+    rng = random.Random(f"{indent}-{ensure_ascii}")
+    for _ in range(200):
+        parser = JSONFieldStream()
+        assert feed_all(parser, random_chunks(text, rng)) == list(DOCUMENT.items())
+        assert parser.closed
+
+
+def test_one_character_at_a_time():
+    parser = JSONFieldStream()
+    assert feed_all(parser, json.dumps(DOCUMENT)) == list(DOCUMENT.items())
+
+
+def test_members_are_emitted_as_soon_as_complete():
+    parser = JSONFieldStream()
+    assert parser.feed('{"summary": "a, b", "hard_skills": [{"x"') == [
+        ("summary", "a, b")
+    ]
+    assert parser.feed(": 1}, 2") == []
+    assert parser.feed('], "score": 3') == [("hard_skills", [{"x": 1}, 2])]
+    assert not parser.closed
+    assert parser.feed("}") == [("score", 3)]
+    assert parser.closed
+
+
+@pytest.mark.parametrize(
+    "value",
+    ['say \\"hi\\"', "ends with \\\\", '\\\\\\"', "{not: an, object}", "[1, 2}", ","],
+)
+def test_escapes_and_delimiters_inside_strings(value):
+    text = '{"key": "' + value + '", "next": 1}'
+    expected = [("key", json.loads('"' + value + '"')), ("next", 1)]
+    for split in range(1, len(text)):
+        parser = JSONFieldStream()
+        assert feed_all(parser, [text[:split], text[split:]]) == expected
+
+
+def test_preamble_and_trailing_text_are_ignored():
+    parser = JSONFieldStream()
+    chunks = ["```json\n", '{"a": 1}', "\n```", '{"b": 2}']
+    assert feed_all(parser, chunks) == [("a", 1)]
+    assert parser.closed
+
+
+def test_empty_object_closes_without_members():
+    parser = JSONFieldStream()
+    assert parser.feed(" { \n } ") == []
+    assert parser.closed
+
+
+def test_malformed_member_raises():
+    parser = JSONFieldStream()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed('{"a": tru, "b": 1}')
@@ -0,0 +1,55 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import local_index
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_INDEX_ENABLED", True)
+    monkeypatch.setattr(settings, "LOCAL_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(local_index, "_index", None)
+    monkeypatch.setattr(local_index, "_missing_logged", False)
+    return tmp_path
+
+
+def build(index_dir):
+    vectors = np.eye(2, dtype=np.float32)
+    jobs = [
+        {"title": "Backend Engineer", "location": "Berlin, Germany"},
+        {"title": "Data Scientist", "location": "Remote"},
+    ]
+    local_index.LocalJobIndex(vectors, jobs).save(str(index_dir))
+
+
+def test_index_built_after_startup_is_picked_up(index_dir):
+    assert asyncio.run(local_index.get_local_index()) is None
+    assert asyncio.run(local_index.get_local_index()) is None
+
+    build(index_dir)
+    index = asyncio.run(local_index.get_local_index())
+    assert index is not None and len(index.jobs) == 2
+    # Only the successful load is cached
+    assert asyncio.run(local_index.get_local_index()) is index
+
+
+def test_disabled_index_is_never_loaded(index_dir, monkeypatch):
+    build(index_dir)
+    monkeypatch.setattr(settings, "LOCAL_INDEX_ENABLED", False)
+    assert local_index.load_local_index() is None
+
+
+def test_search_ranks_by_cosine_and_filters_location(index_dir):
+    build(index_dir)
+    index = local_index.load_local_index()
+    query = np.array([0.9, 0.1], dtype=np.float32)
+    assert [j["title"] for j in index.search(query)] == [
+        "Backend Engineer",
+        "Data Scientist",
+    ]
+    assert [j["title"] for j in index.search(query, location="berlin")] == [
+        "Backend Engineer"
+    ]
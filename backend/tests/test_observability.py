@@ -0,0 +1,47 @@
+import io
+import multiprocessing
+
+from opentelemetry import metrics, trace
+from opentelemetry.sdk.metrics.export import ConsoleMetricExporter
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from app.core import observability
+
+
+def test_import_starts_no_exporters():
+    # What a preloading gunicorn master holds: API proxies only
+    assert not isinstance(trace.get_tracer_provider(), observability.TracerProvider)
+    assert observability._providers == ()
+
+
+def _worker(result):
+    spans, metric_out = InMemorySpanExporter(), io.StringIO()
+    observability.setup_telemetry(
+        span_exporter=spans, metric_exporter=ConsoleMetricExporter(out=metric_out)
+    )
+    with observability.tracer.start_as_current_span("after_fork"):
+        observability.shortlist_counter.add(1)
+    trace.get_tracer_provider().force_flush()
+    metrics.get_meter_provider().force_flush()
+    result.put(
+        (
+            [span.name for span in spans.get_finished_spans()],
+            "ats_shortlisted_total" in metric_out.getvalue(),
+        )
+    )
+    observability.shutdown_telemetry()
+
+
+def test_worker_exports_after_fork():
+    # Smoke check of the gunicorn model: import in the parent, fork, then set up
+    ctx = multiprocessing.get_context("fork")
+    result = ctx.Queue()
+    worker = ctx.Process(target=_worker, args=(result,))
+    worker.start()
+    spans, counted = result.get(timeout=30)
+    worker.join(timeout=30)
+    assert spans == ["after_fork"]
+    assert counted
+    assert worker.exitcode == 0
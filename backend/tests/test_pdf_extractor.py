@@ -0,0 +1,61 @@
+import asyncio
+import time
+from io import BytesIO
+
+import pytest
+from pypdf import PdfWriter
+
+from app.core.config import settings
+from app.services import pdf_extractor
+
+
+def stuck_on_one_page(seconds: float, deadline: float) -> str:
+    # Never reaches a page boundary, so it cannot notice the deadline itself
+    time.sleep(seconds)
+    return "too late"
+
+
+def blank_pdf() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def single_worker(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_WORKERS", 1)
+    pdf_extractor.shutdown()
+    yield
+    pdf_extractor.shutdown()
+
+
+def test_slow_extraction_does_not_block_the_next_request(single_worker):
+    async def scenario():
+        stuck = asyncio.create_task(
+            pdf_extractor._run_with_budget(
+                stuck_on_one_page, 60, deadline=time.time() + 1
+            )
+        )
+        await asyncio.sleep(0.2)  # The stuck call owns the only worker
+        started = time.monotonic()
+        text = await pdf_extractor.extract_resume_text(blank_pdf(), timeout=15)
+        with pytest.raises(asyncio.TimeoutError):
+            await stuck
+        return text, time.monotonic() - started
+
+    text, elapsed = asyncio.run(scenario())
+    assert text == ""
+    assert elapsed < 10  # Not the 60s the stuck worker would have held it
+
+
+def test_pool_is_usable_after_a_timeout(single_worker):
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await pdf_extractor._run_with_budget(
+                stuck_on_one_page, 60, deadline=time.time() + 0.5
+            )
+        return await pdf_extractor.extract_resume_text(blank_pdf(), timeout=15)
+
+    assert asyncio.run(scenario()) == ""
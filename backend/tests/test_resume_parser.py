@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm.limits import CircuitBreaker, TokenBucket
+from app.llm.router import ProviderGate, llm_router
+from app.services import resume_parser
+
+
+class FakeClient:
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, response_model, messages):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    gate = ProviderGate(
+        name="gemini",
+        llm=None,
+        model="gemini-test",
+        concurrency=1,
+        rpm=TokenBucket(10),
+        tpm=TokenBucket(100_000),
+        breaker=CircuitBreaker(failure_threshold=1, cooldown=60),
+    )
+    monkeypatch.setitem(llm_router.gates, "gemini", gate)
+    return gate
+
+
+def use_client(monkeypatch, outcome):
+    monkeypatch.setattr(
+        resume_parser, "get_extraction_client", lambda: FakeClient(outcome)
+    )
+
+
+def test_extraction_is_counted_by_the_gemini_gate(gate, monkeypatch):
+    use_client(monkeypatch, "parsed")
+    result = asyncio.run(resume_parser.extract_structured(None, "resume text"))
+    assert result == "parsed"
+    assert gate.rpm.wait_time(10) > 0  # One request taken from the bucket
+    assert gate.tpm.wait_time(100_000) > 0
+    assert not gate.semaphore.locked()  # Slot released
+    assert gate.breaker.state == "closed"
+
+
+def test_extraction_failure_is_recorded_on_the_breaker(gate, monkeypatch):
+    use_client(monkeypatch, RuntimeError("429 quota exceeded"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(resume_parser.extract_structured(None, "resume text"))
+    assert gate.breaker.state == "open"
+    assert not gate.semaphore.locked()
@@ -0,0 +1,85 @@
+import html
+import random
+import re
+
+import pytest
+
+from app.core.security import SecurityManager
+
+
+def reference_sanitize(text: str) -> str:
+    """The original per-character implementation the fast path must match."""
+    if not text:
+        return ""
+    clean_text = html.escape(text)
+    clean_text = "".join(char for char in clean_text if char.isprintable())
+    return re.sub(r"\s+", " ", clean_text).strip()
+
+
+SAMPLES = [
+    "",
+    "Senior Python developer",
+    "  leading and trailing  ",
+    "<script>alert('x')</script> & \"quotes\"",
+    "tabs\tand\nnew\r\nlines\x0b\x0c end",
+    "controls\x00\x01\x1b[31m\x7f gone",
+    "non-breaking\xa0space and\u3000ideographic\u2028separator",
+    "zero\u200bwidth\u200d joiner\ufeff bom",
+    "emoji 🚀 rocket 👩\u200d💻 coder",
+    "astral tags \U000e0041\U000e0042 and private \U000f0000 use",
+    "mixed 🚀\x00\t\U000e0001 \n日本語 テキスト",
+    " \t\n ",
+    "\x00\x01",
+]
+
+
+def chunked(text: str, rng: random.Random) -> list:
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text), rng.randint(0, 6))))
+    bounds = [0, *cuts, len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_whole_string_matches_reference(text):
+    assert SecurityManager.sanitize_input(text) == reference_sanitize(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_every_chunking_matches_reference(text):
+    rng = random.Random(text)
+    for _ in range(50):
+        chunks = chunked(text, rng)
+        assert SecurityManager.sanitize_input(chunks) == reference_sanitize(text)
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        ["word ", " word"],
+        ["word", " ", "word"],
+        ["word", "", "\t\n", "", "word"],
+        ["word\x00", "\x00word"],
+        ["word", "\x00", "word"],
+        ["word\xa0", "word"],
+        ["  ", "word", "  "],
+        ["🚀", " ", "\U000e0041", "🚀"],
+        ["<b>", "\n\n", "</b>"],
+    ],
+)
+def test_whitespace_runs_across_chunk_boundaries(chunks):
+    text = "".join(chunks)
+    assert SecurityManager.sanitize_input(chunks) == reference_sanitize(text)
+    assert SecurityManager.sanitize_input(iter(chunks)) == reference_sanitize(text)
+
+
+def test_random_text_matches_reference():
+    rng = random.Random(0)
+    alphabet = (
+        "ab <>&\"' \t\n\r\x00\x1f\x7f\xa0\u200b\u3000é日"
+        "🚀\U000e0041\U000f0000\U0010fffd"
+    )
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert SecurityManager.sanitize_input(text) == reference_sanitize(text)
+        chunks = chunked(text, rng)
+        assert SecurityManager.sanitize_input(chunks) == reference_sanitize(text)
@@ -0,0 +1,23 @@
+import pytest
+
+from app.services.weaviate_service import WeaviateService
+
+
+@pytest.mark.parametrize("location", [None, "", "  ", "Remote", " remote "])
+def test_no_location_filter_for_any_location(location):
+    assert WeaviateService._location_filter(location) is None
+
+
+@pytest.mark.parametrize(
+    "location, tokens",
+    [
+        ("San Francisco, CA", ["san", "francisco"]),
+        ("  New-York ", ["new", "york"]),
+        ("München, Germany", ["münchen"]),
+    ],
+)
+def test_location_filter_matches_word_tokens(location, tokens):
+    location_filter = WeaviateService._location_filter(location)
+    assert location_filter.target == "location"
+    assert location_filter.operator.value == "ContainsAll"
+    assert location_filter.value == tokens
@@ -0,0 +1,51 @@
+const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+
+export interface AnalyzeRequest {
+    resume: string
+    job_title?: string
+    location?: string
+}
+
+export async function analyzeProfile(resume: string, job_title = '', location = 'Remote') {
+    const res = await fetch(`${API_URL}/v1/career/analyze`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ resume, job_title, location }),
+    })
+    if (!res.ok) throw new Error(`Analysis failed: ${res.status}`)
+    return res.json()
+}
+
+// Streams partial results (parse, source, score, gap, path) as each agent finishes.
+// Abort the signal to stop the analysis server-side as well.
+export async function streamAnalysis(
+    req: AnalyzeRequest,
+    onEvent: (event: string, data: any) => void,
+    signal?: AbortSignal,
+) {
+    const res = await fetch(`${API_URL}/v1/career/analyze/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+        body: JSON.stringify({ location: 'Remote', ...req }),
+        signal,
+    })
+    if (!res.ok || !res.body) throw new Error(`Analysis failed: ${res.status}`)
+
+    const reader = res.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+
+        let boundary
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, boundary)
+            buffer = buffer.slice(boundary + 2)
+            const event = frame.match(/^event: (.*)$/m)?.[1] ?? 'message'
+            const data = frame.match(/^data: (.*)$/m)?.[1] ?? '{}'
+            onEvent(event, JSON.parse(data))
+        }
+    }
+}